@@ -6,37 +6,58 @@ Reads the existing minimal-product-catalog.csv and adds generated slugs.
 
 import sys
 import csv
+import logging
 import re
+from functools import lru_cache
 sys.path.append('src')
 
 from product_recommendation_engine import ProductCatalogItem
 
+logger = logging.getLogger(__name__)
+
+# Brand prefixes stripped from the start of titles
+BRAND_PREFIXES = ('somush ', 'rogue herbalist ', 'rh ')
+
+# Precompiled slug patterns: characters to drop (quotes and other specials),
+# and runs of whitespace/hyphens that collapse to a single hyphen
+_RE_DROP = re.compile(r'[^\w\s-]+')
+_RE_SEPARATORS = re.compile(r'[\s-]+')
+
+# ASCII fast path: translate table deleting the same characters as _RE_DROP
+_ASCII_DROP_TABLE = {
+    code: None for code in range(128)
+    if not (chr(code).isalnum() or chr(code).isspace() or chr(code) in '_-')
+}
+
+# Titles that are already lowercase-hyphenated slugs pass through unchanged
+_RE_IS_SLUG = re.compile(r'[a-z0-9]+(?:-[a-z0-9]+)*')
+
+@lru_cache(maxsize=4096)
 def generate_slug_from_title(title: str) -> str:
     """Generate a URL slug from the product title using observed patterns."""
+    if not title or _RE_IS_SLUG.fullmatch(title):
+        return title
+
     # Start with the title
     slug = title.lower()
 
     # Remove common brand prefixes if present
-    brand_prefixes = ['somush ', 'rogue herbalist ', 'rh ']
-    for prefix in brand_prefixes:
+    for prefix in BRAND_PREFIXES:
         if slug.startswith(prefix):
             slug = slug[len(prefix):]
             break
 
-    # Remove quotes and special characters
-    slug = re.sub(r'[\'\"]+', '', slug)  # Remove quotes
-    slug = re.sub(r'[^\w\s-]', '', slug)  # Remove special chars except spaces and hyphens
-
-    # Replace spaces with hyphens
-    slug = re.sub(r'\s+', '-', slug)
-
-    # Remove multiple consecutive hyphens
-    slug = re.sub(r'-+', '-', slug)
+    # ASCII titles (the whole current catalog) skip the regex engine: delete
+    # specials with a translate table, then split on whitespace/hyphen runs
+    if slug.isascii():
+        return '-'.join(slug.translate(_ASCII_DROP_TABLE).replace('-', ' ').split())
 
-    # Remove leading/trailing hyphens
-    slug = slug.strip('-')
+    # Remove quotes and special characters except spaces and hyphens
+    slug = _RE_DROP.sub('', slug)
 
-    return slug
+    # Collapse runs of spaces and hyphens into a single hyphen,
+    # then remove leading/trailing hyphens
+    return _RE_SEPARATORS.sub('-', slug).strip('-')
 
 def add_slugs_to_catalog():
     """Add slug field to the product catalog."""
@@ -52,8 +73,11 @@ def add_slugs_to_catalog():
         # Read the input CSV
         reader = csv.DictReader(infile)
 
-        # Get the original field names and add 'Slug'
-        fieldnames = reader.fieldnames + ['Slug']
+        # Get the original field names and add 'Slug' unless it's already there,
+        # in which case the existing column is overwritten
+        fieldnames = list(reader.fieldnames)
+        if 'Slug' not in fieldnames:
+            fieldnames.append('Slug')
 
         with open(output_file, 'w', encoding='utf-8', newline='') as outfile:
             writer = csv.DictWriter(outfile, fieldnames=fieldnames)
@@ -66,12 +90,12 @@ def add_slugs_to_catalog():
                     slug = generate_slug_from_title(title)
                     row['Slug'] = slug
 
-                    # Print progress for first few and every 50th
+                    # Log progress for first few and every 50th
                     if rows_processed < 5 or rows_processed % 50 == 0:
-                        print(f"  {rows_processed + 1:3d}: '{title}' -> '{slug}'")
+                        logger.info("  %3d: '%s' -> '%s'", rows_processed + 1, title, slug)
                 else:
                     row['Slug'] = ''
-                    print(f"  {rows_processed + 1:3d}: Warning - no title found")
+                    logger.warning("  %3d: Warning - no title found", rows_processed + 1)
 
                 writer.writerow(row)
                 rows_processed += 1
@@ -80,4 +104,5 @@ def add_slugs_to_catalog():
     print(f"Updated catalog saved to: {output_file}")
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     add_slugs_to_catalog()
\ No newline at end of file
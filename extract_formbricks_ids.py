@@ -16,15 +16,37 @@ API Version Note:
 """
 
 import os
+import re
 import sys
 import json
-import requests
+import httpx
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 # Your survey ID (from form URL)
 SURVEY_ID = "cmf5homcz0p1kww010hzezjjp"
 # NOTE: Using v1 temporarily - v2 doesn't have surveys/{surveyId} GET endpoint yet
 API_BASE_URL = "https://app.formbricks.com/api/v1/management"
 
+# Anything that is not a letter, digit or underscore (same set as str.isalnum() + "_")
+_NON_IDENTIFIER_CHARS = re.compile(r"\W+")
+
+# ASCII bytes to delete on the fast path: everything except [A-Za-z0-9_]
+_IDENTIFIER_BYTES = frozenset(b"ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789_")
+_NON_IDENTIFIER_BYTES = bytes(b for b in range(256) if b not in _IDENTIFIER_BYTES)
+
+
+def _strip_non_identifier_chars(text: str) -> str:
+    """Drop every character that is not alphanumeric or an underscore."""
+    if text.isascii():
+        return text.encode("ascii").translate(None, _NON_IDENTIFIER_BYTES).decode("ascii")
+    return _NON_IDENTIFIER_CHARS.sub("", text)
+
+
 def fetch_survey_structure(api_key: str, survey_id: str) -> dict:
     """Fetch survey structure from Formbricks API."""
     url = f"{API_BASE_URL}/surveys/{survey_id}"
@@ -34,7 +56,7 @@ def fetch_survey_structure(api_key: str, survey_id: str) -> dict:
     }
 
     print(f"🔍 Fetching survey structure from: {url}")
-    response = requests.get(url, headers=headers)
+    response = httpx.get(url, headers=headers, timeout=30.0, follow_redirects=True)
 
     if response.status_code != 200:
         print(f"❌ Error: {response.status_code}")
@@ -42,6 +64,8 @@ def fetch_survey_structure(api_key: str, survey_id: str) -> dict:
         sys.exit(1)
 
     print(f"✅ Successfully fetched survey structure")
+    if ORJSON_AVAILABLE:
+        return orjson.loads(response.content)
     return response.json()
 
 
@@ -54,8 +78,13 @@ def extract_question_ids(survey: dict) -> dict:
         headline = q.get("headline", {}).get("default", "Unknown")
         question_type = q.get("type")
 
+        # Constant-name prefix used by generate_python_mappings: spaces become
+        # underscores, other punctuation ("?", "'", ...) is stripped
+        var_name = _strip_non_identifier_chars(headline.upper().replace(" ", "_"))
+
         questions[question_id] = {
             "headline": headline,
+            "var_name": var_name,
             "type": question_type,
             "choices": None
         }
@@ -75,26 +104,21 @@ def extract_question_ids(survey: dict) -> dict:
 def generate_python_mappings(questions: dict) -> str:
     """Generate Python code with all the correct mappings."""
 
-    code = "# Auto-generated Formbricks ID mappings\n\n"
-    code += "# Question IDs\n"
+    parts = ["# Auto-generated Formbricks ID mappings\n\n", "# Question IDs\n"]
 
     for qid, info in questions.items():
-        var_name = info['headline'].upper().replace(" ", "_").replace("?", "").replace("'", "")
-        var_name = ''.join(c for c in var_name if c.isalnum() or c == '_')
-        code += f'{var_name}_QUESTION_ID = "{qid}"  # {info["type"]}\n'
+        parts.append(f'{info["var_name"]}_QUESTION_ID = "{qid}"  # {info["type"]}\n')
 
-    code += "\n# Choice ID Mappings\n\n"
+    parts.append("\n# Choice ID Mappings\n\n")
 
     for qid, info in questions.items():
         if info["choices"]:
-            var_name = info['headline'].upper().replace(" ", "_").replace("?", "").replace("'", "")
-            var_name = ''.join(c for c in var_name if c.isalnum() or c == '_')
-            code += f"{var_name}_CHOICES = {{\n"
+            parts.append(f"{info['var_name']}_CHOICES = {{\n")
             for choice_id, label in info["choices"].items():
-                code += f'    "{choice_id}": "{label}",\n'
-            code += "}\n\n"
+                parts.append(f'    "{choice_id}": "{label}",\n')
+            parts.append("}\n\n")
 
-    return code
+    return "".join(parts)
 
 
 def print_summary(questions: dict):
@@ -131,8 +155,12 @@ def main():
     survey = fetch_survey_structure(api_key, SURVEY_ID)
 
     # Save raw JSON
-    with open("formbricks_survey_structure.json", "w") as f:
-        json.dump(survey, f, indent=2)
+    if ORJSON_AVAILABLE:
+        with open("formbricks_survey_structure.json", "wb") as f:
+            f.write(orjson.dumps(survey, option=orjson.OPT_INDENT_2))
+    else:
+        with open("formbricks_survey_structure.json", "w") as f:
+            json.dump(survey, f, indent=2)
     print(f"💾 Saved raw structure to: formbricks_survey_structure.json")
 
     # Extract question IDs
@@ -6,7 +6,7 @@ This script retrieves all products from the Rogue Herbalist WooCommerce store
 and extracts the actual slugs to update the product catalog.
 
 Requirements:
-    pip install requests
+    pip install 'httpx[http2]'
 
 Usage:
     python fetch_woocommerce_slugs.py
@@ -22,10 +22,17 @@ import os
 import sys
 import csv
 import json
-import requests
-from typing import List, Dict, Any
+import httpx
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional
 from pathlib import Path
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 
 # WooCommerce API Configuration
 STORE_URL = "https://rogueherbalist.com"
@@ -37,17 +44,45 @@ CONSUMER_SECRET = os.getenv("WC_CONSUMER_SECRET", "")
 # CONSUMER_KEY = "ck_xxxxxxxxxxxxxxxxxxxx"
 # CONSUMER_SECRET = "cs_xxxxxxxxxxxxxxxxxxxx"
 
+# Concurrent page requests once the total page count is known
+MAX_PAGE_WORKERS = 8
+
+# Connection pool size of the HTTP client shared by all requests
+MAX_CONNECTIONS = 16
+
+
+def parse_json(response: httpx.Response) -> Any:
+    """Decode a JSON response body, using orjson when available."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(response.content)
+    return response.json()
+
+
+def create_client() -> httpx.Client:
+    """HTTP/2 client with a connection pool sized for concurrent requests."""
+    return httpx.Client(
+        http2=True,
+        timeout=30.0,
+        limits=httpx.Limits(max_connections=MAX_CONNECTIONS, max_keepalive_connections=MAX_CONNECTIONS)
+    )
+
 
-def fetch_all_products(per_page: int = 100) -> List[Dict[str, Any]]:
+def fetch_all_products(per_page: int = 100, client: Optional[httpx.Client] = None) -> List[Dict[str, Any]]:
     """
     Fetch all products from WooCommerce API with pagination.
 
     Args:
         per_page: Number of products per page (max 100)
+        client: HTTP client used for every page request (a temporary one
+            is created if not given)
 
     Returns:
         List of product dictionaries with id, name, slug, sku, permalink
     """
+    if client is None:
+        with create_client() as client:
+            return fetch_all_products(per_page, client)
+
     if not CONSUMER_KEY or not CONSUMER_SECRET:
         print("❌ Error: WooCommerce API credentials not set!")
         print("Set WC_CONSUMER_KEY and WC_CONSUMER_SECRET environment variables")
@@ -55,7 +90,6 @@ def fetch_all_products(per_page: int = 100) -> List[Dict[str, Any]]:
         sys.exit(1)
 
     all_products = []
-    page = 1
 
     # API endpoint with field filtering for efficiency
     endpoint = f"{STORE_URL}/wp-json/{API_VERSION}/products"
@@ -63,44 +97,67 @@ def fetch_all_products(per_page: int = 100) -> List[Dict[str, Any]]:
     # Authentication
     auth = (CONSUMER_KEY, CONSUMER_SECRET)
 
-    print(f"🔍 Fetching products from {STORE_URL}...")
-
-    while True:
+    def fetch_page(page: int) -> httpx.Response:
         # Request parameters
         params = {
             "per_page": per_page,
             "page": page,
             "_fields": "id,name,slug,sku,permalink,status,stock_status"
         }
+        response = client.get(endpoint, auth=auth, params=params)
+        response.raise_for_status()
+        return response
 
-        try:
-            response = requests.get(endpoint, auth=auth, params=params, timeout=30)
-            response.raise_for_status()
+    print(f"🔍 Fetching products from {STORE_URL}...")
 
-            products = response.json()
+    # First page tells us how many pages there are
+    try:
+        response = fetch_page(1)
+        products = parse_json(response)
+    except (httpx.HTTPError, ValueError) as e:
+        print(f"❌ Error fetching page 1: {e}")
+        return all_products
 
-            # Check if we got any products
-            if not products:
-                break
+    if not products:
+        print(f"✅ Fetched {len(all_products)} total products")
+        return all_products
 
-            all_products.extend(products)
+    all_products.extend(products)
 
-            # Get total pages from headers
-            total_pages = int(response.headers.get('X-WP-TotalPages', 1))
-            total_items = int(response.headers.get('X-WP-Total', len(products)))
+    # Get total pages from headers
+    total_pages = int(response.headers.get('X-WP-TotalPages', 1))
+    total_items = int(response.headers.get('X-WP-Total', len(products)))
 
-            print(f"   Page {page}/{total_pages}: Fetched {len(products)} products "
-                  f"(Total: {len(all_products)}/{total_items})")
+    print(f"   Page 1/{total_pages}: Fetched {len(products)} products "
+          f"(Total: {len(all_products)}/{total_items})")
 
-            # Check if we've fetched all pages
-            if page >= total_pages:
-                break
+    # Fetch remaining pages concurrently, collecting results in page order
+    if total_pages > 1:
+        with ThreadPoolExecutor(max_workers=min(MAX_PAGE_WORKERS, total_pages - 1)) as executor:
+            futures = {
+                page: executor.submit(fetch_page, page)
+                for page in range(2, total_pages + 1)
+            }
 
-            page += 1
+            for page, future in futures.items():
+                try:
+                    products = parse_json(future.result())
+                except (httpx.HTTPError, ValueError) as e:
+                    print(f"❌ Error fetching page {page}: {e}")
+                    break
 
-        except requests.exceptions.RequestException as e:
-            print(f"❌ Error fetching page {page}: {e}")
-            break
+                # Check if we got any products
+                if not products:
+                    break
+
+                all_products.extend(products)
+
+                print(f"   Page {page}/{total_pages}: Fetched {len(products)} products "
+                      f"(Total: {len(all_products)}/{total_items})")
+
+            # Don't start pages we are no longer going to use
+            for future in futures.values():
+                future.cancel()
 
     print(f"✅ Fetched {len(all_products)} total products")
     return all_products
@@ -113,7 +170,7 @@ def update_catalog_with_slugs(products: List[Dict[str, Any]], catalog_path: Path
     Args:
         products: List of product dicts from WooCommerce API
         catalog_path: Path to current catalog CSV
-        output_path: Path to save updated catalog
+        output_path: Path to save updated catalog (must differ from catalog_path)
     """
     # Create slug lookup by product ID
     slug_lookup = {
@@ -123,32 +180,42 @@ def update_catalog_with_slugs(products: List[Dict[str, Any]], catalog_path: Path
 
     print(f"\n📝 Updating catalog: {catalog_path}")
 
-    # Read current catalog
-    updated_rows = []
-    with open(catalog_path, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        fieldnames = reader.fieldnames
+    # Rows are streamed straight to the output, so it can't overwrite the input
+    if Path(output_path).resolve() == Path(catalog_path).resolve():
+        raise ValueError("output_path must differ from catalog_path")
+
+    # Stream the catalog, resolving column positions once from the header
+    with open(catalog_path, 'r', encoding='utf-8', newline='') as infile, \
+            open(output_path, 'w', encoding='utf-8', newline='') as outfile:
+        reader = csv.reader(infile)
+        writer = csv.writer(outfile)
+
+        header = next(reader)
+        id_idx = header.index('ID')
+        if 'Slug' not in header:
+            header.append('Slug')
+        slug_idx = header.index('Slug')
+        num_columns = len(header)
+        writer.writerow(header)
 
         for row in reader:
-            product_id = row['ID']
-            old_slug = row.get('Slug', '')
+            # Pad short rows so every column (including a new Slug column) exists
+            if len(row) < num_columns:
+                row.extend([''] * (num_columns - len(row)))
+
+            product_id = row[id_idx]
+            old_slug = row[slug_idx]
 
             # Update slug if we have it from API
-            if product_id in slug_lookup:
-                new_slug = slug_lookup[product_id]
+            new_slug = slug_lookup.get(product_id)
+            if new_slug is not None:
                 if old_slug != new_slug:
                     print(f"   Updated {product_id}: {old_slug} → {new_slug}")
-                row['Slug'] = new_slug
+                row[slug_idx] = new_slug
             else:
                 print(f"   ⚠️  Product {product_id} not found in API response")
 
-            updated_rows.append(row)
-
-    # Write updated catalog
-    with open(output_path, 'w', encoding='utf-8', newline='') as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(updated_rows)
+            writer.writerow(row)
 
     print(f"✅ Updated catalog saved to: {output_path}")
 
@@ -160,30 +227,44 @@ def save_api_response(products: List[Dict[str, Any]], output_path: Path):
     print(f"💾 Raw API response saved to: {output_path}")
 
 
-def verify_slugs(products: List[Dict[str, Any]], sample_size: int = 5):
+def verify_slugs(products: List[Dict[str, Any]], sample_size: int = 5, client: Optional[httpx.Client] = None):
     """
     Verify that fetched slugs are correct by testing URLs.
 
     Args:
         products: List of product dicts
         sample_size: Number of products to verify
+        client: HTTP client used for the HEAD checks (a temporary one is
+            created if not given)
     """
+    if client is None:
+        with create_client() as client:
+            return verify_slugs(products, sample_size, client)
+
     print(f"\n🔍 Verifying {sample_size} sample product URLs...")
 
     import random
     samples = random.sample(products, min(sample_size, len(products)))
 
-    for product in samples:
+    def check_url(product: Dict[str, Any]) -> str:
         product_id = product['id']
         slug = product['slug']
         permalink = product.get('permalink', f"{STORE_URL}/product/{slug}/")
 
         try:
-            response = requests.head(permalink, timeout=10, allow_redirects=True)
+            response = client.head(permalink, timeout=10.0, follow_redirects=True)
             status = "✅" if response.status_code == 200 else f"❌ {response.status_code}"
-            print(f"   {status} {product_id}: {slug}")
-        except requests.exceptions.RequestException as e:
-            print(f"   ❌ {product_id}: {slug} - Error: {e}")
+            return f"   {status} {product_id}: {slug}"
+        except httpx.HTTPError as e:
+            return f"   ❌ {product_id}: {slug} - Error: {e}"
+
+    if not samples:
+        return
+
+    # HEAD checks are independent, so run them concurrently over the shared client
+    with ThreadPoolExecutor(max_workers=min(MAX_CONNECTIONS, len(samples))) as executor:
+        for line in executor.map(check_url, samples):
+            print(line)
 
 
 def main():
@@ -192,20 +273,22 @@ def main():
     print("WooCommerce Product Slug Fetcher")
     print("=" * 70)
 
-    # Fetch all products from API
-    products = fetch_all_products(per_page=100)
+    # One HTTP/2 client for the whole run so TCP/TLS connections are reused
+    with create_client() as client:
+        # Fetch all products from API
+        products = fetch_all_products(per_page=100, client=client)
 
-    if not products:
-        print("❌ No products fetched. Check API credentials and try again.")
-        sys.exit(1)
+        if not products:
+            print("❌ No products fetched. Check API credentials and try again.")
+            sys.exit(1)
 
-    # Save raw API response
-    api_response_path = Path("data/rogue-herbalist/woocommerce-api-products.json")
-    api_response_path.parent.mkdir(parents=True, exist_ok=True)
-    save_api_response(products, api_response_path)
+        # Save raw API response
+        api_response_path = Path("data/rogue-herbalist/woocommerce-api-products.json")
+        api_response_path.parent.mkdir(parents=True, exist_ok=True)
+        save_api_response(products, api_response_path)
 
-    # Verify some slugs
-    verify_slugs(products, sample_size=5)
+        # Verify some slugs
+        verify_slugs(products, sample_size=5, client=client)
 
     # Update catalog with correct slugs
     catalog_path = Path("data/rogue-herbalist/minimal-product-catalog.csv")
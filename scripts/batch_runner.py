@@ -4,52 +4,107 @@ Batch Runner for IC-ML Project
 Run multiple experiments and generate consolidated reports
 """
 
+import os
+import re
 import subprocess
 import json
+import shlex
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Jobs are dominated by LLM API latency; keep this under the provider rate limit
+MAX_CONCURRENT_JOBS = 4
+
+# How much of each job's output is embedded in the JSON report
+OUTPUT_TAIL_BYTES = 4096
+
+
+def read_tail(path: Path, num_bytes: int = OUTPUT_TAIL_BYTES) -> str:
+    """Return the last num_bytes of a file as text"""
+    with open(path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        f.seek(max(0, f.tell() - num_bytes))
+        return f.read().decode('utf-8', errors='replace')
+
 
 class BatchRunner:
-    def __init__(self):
+    def __init__(self, max_workers: int = MAX_CONCURRENT_JOBS):
         self.results = []
         self.start_time = datetime.now()
-
-    def run_command(self, cmd: str, description: str) -> Dict[str, Any]:
-        """Execute a command and capture results"""
+        self.max_workers = max_workers
+        self.log_dir = Path("batch_logs") / self.start_time.strftime('%Y%m%d_%H%M%S')
+
+    def run_command(self, argv: List[str], description: str) -> Dict[str, Any]:
+        """Execute a command (argv list, no shell), streaming its output to a log file"""
+        cmd = shlex.join(argv)
+        log_name = re.sub(r'[^A-Za-z0-9]+', '-', description).strip('-').lower()
+        log_path = self.log_dir / f"{log_name}.log"
         print(f"\n🔄 {description}")
         print(f"   Command: {cmd}")
+        print(f"   Log: {log_path}")
+
+        self.log_dir.mkdir(parents=True, exist_ok=True)
 
         try:
-            result = subprocess.run(
-                cmd,
-                shell=True,
-                capture_output=True,
-                text=True,
-                timeout=300  # 5 minute timeout
-            )
+            with open(log_path, 'w') as log_file:
+                result = subprocess.run(
+                    argv,
+                    stdout=log_file,
+                    stderr=subprocess.STDOUT,
+                    timeout=300  # 5 minute timeout
+                )
 
             success = result.returncode == 0
-            print(f"   {'✅' if success else '❌'} {'Completed' if success else 'Failed'}")
+            print(f"   {'✅' if success else '❌'} {'Completed' if success else 'Failed'}: {description}")
 
             return {
                 "description": description,
                 "command": cmd,
                 "success": success,
-                "stdout": result.stdout,
-                "stderr": result.stderr,
+                "stdout_path": str(log_path),
+                "stdout_tail": read_tail(log_path),
                 "timestamp": datetime.now().isoformat()
             }
         except subprocess.TimeoutExpired:
-            print(f"   ⏰ Timeout exceeded")
+            print(f"   ⏰ Timeout exceeded: {description}")
             return {
                 "description": description,
                 "command": cmd,
                 "success": False,
                 "error": "Timeout exceeded",
+                "stdout_path": str(log_path),
+                "stdout_tail": read_tail(log_path),
                 "timestamp": datetime.now().isoformat()
             }
+        except OSError as e:
+            # Without a shell, a missing executable raises instead of exiting 127
+            print(f"   ❌ Failed to start: {description}")
+            return {
+                "description": description,
+                "command": cmd,
+                "success": False,
+                "error": str(e),
+                "timestamp": datetime.now().isoformat()
+            }
+
+    def run_batch(self, tasks: List[Tuple[List[str], str]]):
+        """Run independent (argv, description) tasks concurrently, recording results in task order"""
+        if not tasks:
+            return
+
+        with ThreadPoolExecutor(max_workers=min(len(tasks), self.max_workers)) as executor:
+            results = list(executor.map(lambda task: self.run_command(*task), tasks))
+
+        self.results.extend(results)
 
     def run_health_quiz_batch(self):
         """Run health quiz for all personas"""
@@ -59,10 +114,12 @@ class BatchRunner:
             "Lisa Thompson"
         ]
 
-        for persona in personas:
-            cmd = f'python3 src/run_health_quiz.py --persona "{persona}" --model gpt4o_mini'
-            result = self.run_command(cmd, f"Health Quiz: {persona}")
-            self.results.append(result)
+        tasks = [
+            (["python3", "src/run_health_quiz.py", "--persona", persona, "--model", "gpt4o_mini"],
+             f"Health Quiz: {persona}")
+            for persona in personas
+        ]
+        self.run_batch(tasks)
 
     def run_classification_tests(self):
         """Run product classification tests"""
@@ -72,10 +129,12 @@ class BatchRunner:
             "Joint Support Formula"
         ]
 
-        for product in test_products:
-            cmd = f'python3 src/run_assign_cat.py --single-product "{product}" --model gpt4o_mini'
-            result = self.run_command(cmd, f"Classification: {product}")
-            self.results.append(result)
+        tasks = [
+            (["python3", "src/run_assign_cat.py", "--single-product", product, "--model", "gpt4o_mini"],
+             f"Classification: {product}")
+            for product in test_products
+        ]
+        self.run_batch(tasks)
 
     def generate_summary(self):
         """Generate summary report"""
@@ -95,8 +154,12 @@ class BatchRunner:
 
         # Save JSON report
         report_path = Path(f"batch_report_{self.start_time.strftime('%Y%m%d_%H%M%S')}.json")
-        with open(report_path, 'w') as f:
-            json.dump(summary, f, indent=2)
+        if ORJSON_AVAILABLE:
+            with open(report_path, 'wb') as f:
+                f.write(orjson.dumps(summary, option=orjson.OPT_INDENT_2))
+        else:
+            with open(report_path, 'w') as f:
+                json.dump(summary, f, indent=2)
 
         print(f"\n📊 Batch Run Summary")
         print(f"   Duration: {duration:.1f}s")
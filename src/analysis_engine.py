@@ -6,11 +6,172 @@ Provides modular, reusable analysis functions that can be applied to
 classification results either during initial runs or in post-processing.
 """
 
+import csv
 import json
-from collections import defaultdict
+import sys
+from collections import Counter, defaultdict
 from datetime import datetime
+from itertools import islice
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterator, Optional, Tuple
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+# Quality indicator per assignments-per-product bucket in the markdown report
+_QUALITY_INDICATORS = {0: "⚠️ Failed Classification", 1: "✅ Perfect Classification"}
+_MULTIPLE_ASSIGNMENTS_INDICATOR = "🔄 Multiple Categories"
+
+# (minimum consistency rate, status icon, assessment), best grade first
+_CONSISTENCY_GRADES = (
+    (95, "✅", "🟢 **Excellent** - Classification system performing optimally"),
+    (90, "⚠️", "🟡 **Good** - Minor inconsistencies, monitoring recommended"),
+    (float("-inf"), "❌", "🔴 **Needs Attention** - Classification inconsistencies require investigation"),
+)
+
+# Business context line for well-known categories in the market focus section
+_BUSINESS_CONTEXT = {
+    "immune-support": "Strong focus on immune system health products",
+    "gut-health": "Significant emphasis on digestive wellness",
+    "stress-mood-anxiety": "Mental wellness and stress management focus",
+    "energy-vitality": "Energy and vitality enhancement products",
+}
+_DEFAULT_BUSINESS_CONTEXT = "Specialized health focus area"
+
+
+# Common models shown in the cost comparison table
+COMPARISON_MODELS = (
+    'gpt-4o-mini', 'gpt-4o', 'gpt-4-turbo',
+    'claude-3-haiku', 'claude-3-5-haiku', 'claude-3-5-sonnet', 'claude-3-opus'
+)
+
+# LiteLLM module, imported on first cost analysis (its import is slow)
+_litellm = None
+
+
+def _get_litellm():
+    """Import LiteLLM once per process; raises ImportError if not installed."""
+    global _litellm
+    if _litellm is None:
+        import litellm
+        _litellm = litellm
+    return _litellm
+
+
+# classifications.csv columns drawn from a small vocabulary, interned on load
+_INTERNED_FIELDS = ('taxonomy_slug', 'category_slug', 'sub_category_slug', 'tag', 'product_id')
+
+# Buffer size for files written in many small pieces
+_WRITE_BUFFER_SIZE = 1 << 20
+
+
+def _dump_json(data: Any) -> bytes:
+    """Serialize data as indented JSON, using orjson when available."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2).encode()
+
+
+def _write_bytes(path: Path, data: bytes) -> None:
+    """Write already-encoded data to a file."""
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def _write_combined_json(path: Path, sections: Dict[str, bytes]) -> None:
+    """Write an indented JSON object from already-serialized top-level values.
+
+    Each value is re-indented one level and streamed into place, producing
+    the same file as serializing the whole object again.
+    """
+    with open(path, "wb", buffering=_WRITE_BUFFER_SIZE) as f:
+        if not sections:
+            f.write(b"{}")
+            return
+        f.write(b"{\n")
+        for i, (key, section) in enumerate(sections.items()):
+            if i:
+                f.write(b",\n")
+            # Newlines only occur between tokens (escaped inside strings)
+            f.writelines((b"  ", json.dumps(key).encode(), b": ", section.replace(b"\n", b"\n  ")))
+        f.write(b"\n}")
+
+
+def _materialize_columns(classifications: List[Dict[str, Any]]) -> Dict[str, List[Any]]:
+    """Split classification rows into parallel, pre-stripped field lists."""
+    return {
+        "product_ids": [str(c.get('product_id', '')).strip() for c in classifications],
+        "categories": [str(c.get('category_slug', '')).strip() for c in classifications],
+        "subcategories": [str(c.get('sub_category_slug', '')).strip() for c in classifications],
+        "slugs": [c.get('slug') for c in classifications],
+    }
+
+
+def _fold_rows(intermediates: Dict[str, Any], classifications: List[Dict[str, Any]]) -> None:
+    """Add classification rows to the shared columns and counters in place."""
+    new_columns = _materialize_columns(classifications)
+    columns = intermediates["columns"]
+    for name, values in new_columns.items():
+        columns[name].extend(values)
+
+    # Subcategory counts grouped under their parent category: pairs are
+    # counted in C, then only the distinct pairs are regrouped
+    subcategory_counts = intermediates["subcategory_counts"]
+    pair_counts = Counter(zip(new_columns["categories"], new_columns["subcategories"]))
+    for (category, subcategory), count in pair_counts.items():
+        if category and subcategory:
+            subcategory_counts[category][subcategory] += count
+
+    # filter(None, ...) drops empty values without a Python-level
+    # generator, so Counter's C counting loop sees every element
+    assignments_per_product = intermediates["assignments_per_product"]
+    assignments_per_product.update(filter(None, new_columns["product_ids"]))
+    intermediates["category_counts"].update(filter(None, new_columns["categories"]))
+
+    # Fields are pre-stripped strings, so empty ones are exactly ''
+    intermediates["empty_categories"] += new_columns["categories"].count('')
+    intermediates["empty_subcategories"] += new_columns["subcategories"].count('')
+    intermediates["empty_product_ids"] += new_columns["product_ids"].count('')
+
+    # Per-product counts may have changed anywhere, so rebuild over products
+    intermediates["assignment_counts"] = Counter(assignments_per_product.values())
+
+
+def aggregate_classifications(classifications: List[Dict[str, Any]],
+                              intermediates: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Columnar view and shared counters read by the count-based analyses.
+
+    Pass the result to the generate_* methods (or run_all_analyses) so they
+    aggregate once between them. To re-analyze after appending a batch, pass
+    the intermediates for the earlier rows back in with just the new rows:
+    they are folded in place, so the work is O(batch) rather than O(total).
+    Rows edited in place need a fresh aggregation.
+    """
+    if intermediates is None:
+        intermediates = {
+            "columns": {"product_ids": [], "categories": [], "subcategories": [], "slugs": []},
+            "assignments_per_product": Counter(),
+            "category_counts": Counter(),
+            "subcategory_counts": defaultdict(Counter),
+            "empty_categories": 0,
+            "empty_subcategories": 0,
+            "empty_product_ids": 0,
+        }
+    _fold_rows(intermediates, classifications)
+    return intermediates
+
+
+def _category_lines(category_distribution: Dict[str, Any]) -> Iterator[str]:
+    """Markdown lines for each category followed by its indented subcategories."""
+    for category, data in category_distribution.items():
+        yield f"**{category}:** {data['count']} ({data['percentage']}%)"
+        for subcategory, subdata in data['subcategories'].items():
+            yield f"  {subcategory}: {subdata['count']} ({subdata['percentage']}%)"
+        yield ""  # Empty line between categories
 
 
 class ClassificationAnalyzer:
@@ -24,11 +185,18 @@ class ClassificationAnalyzer:
             "quality_metrics": self.generate_quality_metrics,
             "cost_analysis": self.generate_cost_analysis,
         }
+        # Per-token (input, output) prices for COMPARISON_MODELS, filled on first comparison
+        self._comparison_prices: Optional[Dict[str, Tuple[float, float]]] = None
 
     def run_all_analyses(self, classifications: List[Dict[str, Any]],
                         token_usage: Optional[Dict[str, Any]] = None,
-                        model_used: Optional[str] = None) -> Dict[str, Any]:
-        """Run all available analyses on classification results."""
+                        model_used: Optional[str] = None,
+                        intermediates: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Run all available analyses on classification results.
+
+        intermediates may come from aggregate_classifications for the same
+        rows; otherwise the rows are aggregated once for this call.
+        """
         results = {
             "analysis_metadata": {
                 "version": self.analysis_version,
@@ -43,7 +211,10 @@ class ClassificationAnalyzer:
                 if analysis_name == "cost_analysis":
                     results[analysis_name] = analysis_func(classifications, token_usage, model_used)
                 else:
-                    results[analysis_name] = analysis_func(classifications)
+                    # Aggregate on first use, under this analysis's guard
+                    if intermediates is None:
+                        intermediates = aggregate_classifications(classifications)
+                    results[analysis_name] = analysis_func(classifications, intermediates)
             except Exception as e:
                 results[analysis_name] = {
                     "error": str(e),
@@ -53,7 +224,8 @@ class ClassificationAnalyzer:
         return results
 
     def run_specific_analyses(self, classifications: List[Dict[str, Any]],
-                            analysis_names: List[str]) -> Dict[str, Any]:
+                            analysis_names: List[str],
+                            intermediates: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Run only specified analyses."""
         results = {
             "analysis_metadata": {
@@ -66,8 +238,14 @@ class ClassificationAnalyzer:
 
         for analysis_name in analysis_names:
             if analysis_name in self.available_analyses:
+                analysis_func = self.available_analyses[analysis_name]
                 try:
-                    results[analysis_name] = self.available_analyses[analysis_name](classifications)
+                    if analysis_name == "cost_analysis":
+                        results[analysis_name] = analysis_func(classifications)
+                    else:
+                        if intermediates is None:
+                            intermediates = aggregate_classifications(classifications)
+                        results[analysis_name] = analysis_func(classifications, intermediates)
                 except Exception as e:
                     results[analysis_name] = {
                         "error": str(e),
@@ -81,120 +259,111 @@ class ClassificationAnalyzer:
 
         return results
 
-    def generate_assignment_histogram(self, classifications: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def generate_assignment_histogram(self, classifications: List[Dict[str, Any]],
+                                      intermediates: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Generate histogram analysis of classification assignments per product."""
-        assignments_per_product = defaultdict(int)
+        if intermediates is None:
+            intermediates = aggregate_classifications(classifications)
+        columns = intermediates["columns"]
+        assignments_per_product = intermediates["assignments_per_product"]
 
-        for classification in classifications:
-            product_id = str(classification.get('product_id', '')).strip()
-            if product_id:  # Only count non-empty product IDs
-                assignments_per_product[product_id] += 1
+        # Rows with no product_id count as zero assignments
+        zero_assignments = intermediates["empty_product_ids"]
 
-        # Count frequency of assignment counts
-        assignment_counts = list(assignments_per_product.values())
-        histogram_data = defaultdict(int)
-
-        for count in assignment_counts:
-            histogram_data[count] += 1
-
-        # Count products with zero assignments (empty product_id)
-        zero_assignments = 0
-        for classification in classifications:
-            product_id = str(classification.get('product_id', '')).strip()
-            if not product_id:
-                zero_assignments += 1
+        # Frequency of assignment counts (copied, the zero bucket is added below)
+        histogram_data = Counter(intermediates["assignment_counts"])
 
         if zero_assignments > 0:
             histogram_data[0] = zero_assignments
 
-        # Convert to regular dict and calculate statistics
-        histogram_dict = dict(histogram_data)
-        total_products = sum(histogram_dict.values())
+        # Every distinct product is one histogram entry, plus the unassigned rows
+        total_products = len(assignments_per_product) + zero_assignments
 
-        # Calculate percentages
+        # Calculate percentages, accumulating the summary in the same pass
         histogram_with_percentages = {}
-        for assignments, count in histogram_dict.items():
+        multiple_assignments = 0
+        max_assignments = 0
+        for assignments, count in histogram_data.items():
             percentage = (count / total_products * 100) if total_products > 0 else 0
             histogram_with_percentages[str(assignments)] = {
                 "products": count,
                 "percentage": round(percentage, 1)
             }
+            if assignments > 1:
+                multiple_assignments += count
+            if assignments > max_assignments:
+                max_assignments = assignments
+
+        # Find examples of products with multiple assignments: the top 10 by
+        # count are selected with a bounded heap, then singletons are dropped
+        top_multi_assigned = []
+        for product_id, count in assignments_per_product.most_common(10):
+            if count <= 1:
+                break
+            top_multi_assigned.append((product_id, count))
+
+        # Inverted index product_id -> assignments/slug, built in one pass and
+        # only for the example products
+        product_details = {product_id: {"assignments": [], "slug": None}
+                           for product_id, _ in top_multi_assigned}
+        if product_details:
+            for product_id, category, subcategory, slug in zip(
+                    columns["product_ids"], columns["categories"],
+                    columns["subcategories"], columns["slugs"]):
+                details = product_details.get(product_id)
+                if details is None:
+                    continue
+                details["assignments"].append(f"{category}/{subcategory}" if subcategory else category)
+                # Keep slug from first classification that has one
+                if not details["slug"] and slug:
+                    details["slug"] = slug
 
-        # Find examples of products with multiple assignments
         multi_assigned_examples = []
-        multi_assigned = {k: v for k, v in assignments_per_product.items() if v > 1}
-        for product_id, count in sorted(multi_assigned.items(), key=lambda x: x[1], reverse=True)[:10]:
-            # Get the actual assignments for this product
-            product_assignments = []
-            product_slug = None
-            for classification in classifications:
-                if str(classification.get('product_id', '')).strip() == product_id:
-                    category = classification.get('category_slug', '')
-                    subcategory = classification.get('sub_category_slug', '')
-                    product_assignments.append(f"{category}/{subcategory}" if subcategory else category)
-                    # Get slug from first matching classification
-                    if not product_slug and classification.get('slug'):
-                        product_slug = classification.get('slug')
-
+        for product_id, count in top_multi_assigned:
+            details = product_details[product_id]
             multi_assigned_examples.append({
                 "product_id": product_id,
-                "product_slug": product_slug,
+                "product_slug": details["slug"],
                 "assignment_count": count,
-                "assignments": product_assignments
+                "assignments": details["assignments"]
             })
 
         return {
             "total_products_classified": total_products,
             "assignment_histogram": histogram_with_percentages,
             "summary": {
-                "zero_assignments": histogram_dict.get(0, 0),
-                "single_assignments": histogram_dict.get(1, 0),
-                "multiple_assignments": sum(count for assignments, count in histogram_dict.items() if assignments > 1),
-                "max_assignments_per_product": max(histogram_dict.keys()) if histogram_dict else 0
+                "zero_assignments": zero_assignments,
+                "single_assignments": histogram_data[1],
+                "multiple_assignments": multiple_assignments,
+                "max_assignments_per_product": max_assignments
             },
             "multi_assignment_examples": multi_assigned_examples
         }
 
-    def generate_category_distribution(self, classifications: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def generate_category_distribution(self, classifications: List[Dict[str, Any]],
+                                       intermediates: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Generate category and subcategory distribution analysis."""
-        category_counts = defaultdict(int)
-        subcategory_counts = defaultdict(int)
+        if intermediates is None:
+            intermediates = aggregate_classifications(classifications)
+        category_counts = intermediates["category_counts"]
+        subcategory_counts = intermediates["subcategory_counts"]
 
-        for classification in classifications:
-            category = str(classification.get('category_slug', '')).strip()
-            subcategory = str(classification.get('sub_category_slug', '')).strip()
-
-            if category:
-                category_counts[category] += 1
-
-                if subcategory:
-                    subcategory_key = f"{category}/{subcategory}"
-                    subcategory_counts[subcategory_key] += 1
-
-        # Convert to regular dicts and sort
-        category_dict = dict(category_counts)
-        subcategory_dict = dict(subcategory_counts)
-
-        total_assignments = sum(category_dict.values())
+        total_assignments = sum(category_counts.values())
 
         # Create structured distribution with percentages
         distribution = {}
-        for category, count in sorted(category_dict.items(), key=lambda x: x[1], reverse=True):
+        for category, count in category_counts.most_common():
             percentage = (count / total_assignments * 100) if total_assignments > 0 else 0
 
-            # Find subcategories for this category
-            subcategories = {}
-            for subcat_key, subcat_count in subcategory_dict.items():
-                if subcat_key.startswith(f"{category}/"):
-                    subcategory = subcat_key.split('/', 1)[1]
-                    subcat_percentage = (subcat_count / count * 100) if count > 0 else 0
-                    subcategories[subcategory] = {
-                        "count": subcat_count,
-                        "percentage": round(subcat_percentage, 1)
-                    }
-
-            # Sort subcategories by count
-            sorted_subcategories = dict(sorted(subcategories.items(), key=lambda x: x[1]['count'], reverse=True))
+            # Subcategories for this category, sorted by count
+            sorted_subcategories = {}
+            subcategories = subcategory_counts.get(category)
+            for subcategory, subcat_count in (subcategories.most_common() if subcategories else ()):
+                subcat_percentage = (subcat_count / count * 100) if count > 0 else 0
+                sorted_subcategories[subcategory] = {
+                    "count": subcat_count,
+                    "percentage": round(subcat_percentage, 1)
+                }
 
             distribution[category] = {
                 "count": count,
@@ -202,36 +371,39 @@ class ClassificationAnalyzer:
                 "subcategories": sorted_subcategories
             }
 
+        # Most frequent category (first seen wins ties, as with max())
+        top_items = category_counts.most_common(1)
+        top_category, top_category_count = top_items[0] if top_items else (None, 0)
+
         return {
             "total_assignments": total_assignments,
             "category_distribution": distribution,
             "summary": {
-                "total_categories": len(category_dict),
-                "total_subcategories": len(subcategory_dict),
-                "top_category": max(category_dict.items(), key=lambda x: x[1])[0] if category_dict else None,
-                "top_category_count": max(category_dict.values()) if category_dict else 0
+                "total_categories": len(category_counts),
+                "total_subcategories": sum(len(subcats) for subcats in subcategory_counts.values()),
+                "top_category": top_category,
+                "top_category_count": top_category_count
             }
         }
 
-    def generate_quality_metrics(self, classifications: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def generate_quality_metrics(self, classifications: List[Dict[str, Any]],
+                                 intermediates: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Generate quality and consistency metrics for classifications."""
+        if intermediates is None:
+            intermediates = aggregate_classifications(classifications)
+        assignments_per_product = intermediates["assignments_per_product"]
+
         metrics = {
             "total_classifications": len(classifications),
-            "unique_products": len(set(str(c.get('product_id', '')).strip() for c in classifications if c.get('product_id', '').strip())),
-            "empty_categories": sum(1 for c in classifications if not str(c.get('category_slug', '')).strip()),
-            "empty_subcategories": sum(1 for c in classifications if not str(c.get('sub_category_slug', '')).strip()),
+            "unique_products": len(assignments_per_product),
+            "empty_categories": intermediates["empty_categories"],
+            "empty_subcategories": intermediates["empty_subcategories"],
             "consistency_rate": 0.0
         }
 
         # Calculate consistency rate (products with single assignments)
         if metrics["total_classifications"] > 0:
-            assignments_per_product = defaultdict(int)
-            for classification in classifications:
-                product_id = str(classification.get('product_id', '')).strip()
-                if product_id:
-                    assignments_per_product[product_id] += 1
-
-            single_assignments = sum(1 for count in assignments_per_product.values() if count == 1)
+            single_assignments = intermediates["assignment_counts"][1]
             metrics["consistency_rate"] = round((single_assignments / len(assignments_per_product) * 100), 1) if assignments_per_product else 0
 
         return metrics
@@ -240,8 +412,15 @@ class ClassificationAnalyzer:
                               token_usage: Optional[Dict[str, Any]] = None,
                               model_used: Optional[str] = None) -> Dict[str, Any]:
         """Generate cost analysis using LiteLLM's built-in cost functions."""
+        # Nothing to price: skip importing LiteLLM entirely
+        if not classifications and not token_usage:
+            return {
+                "model_used": model_used,
+                "total_classifications": 0,
+            }
+
         try:
-            from litellm import completion_cost, cost_per_token
+            litellm = _get_litellm()
         except ImportError:
             return {
                 "error": "LiteLLM not available for cost calculation",
@@ -264,7 +443,7 @@ class ClassificationAnalyzer:
                 output_tokens = token_usage.get('total_completion_tokens', 0)
 
                 # Use LiteLLM's built-in cost calculation with token counts
-                input_cost_per_token, output_cost_per_token = cost_per_token(
+                input_cost_per_token, output_cost_per_token = litellm.cost_per_token(
                     model=model_used,
                     prompt_tokens=input_tokens,
                     completion_tokens=output_tokens
@@ -319,46 +498,69 @@ class ClassificationAnalyzer:
         else:
             return f"${cost:.2f}"
 
-    def _compare_model_costs_litellm(self, input_tokens: int, output_tokens: int, current_cost: float) -> Dict:
-        """Compare costs across models using LiteLLM."""
-        from litellm import cost_per_token
+    def _get_comparison_prices(self) -> Dict[str, Tuple[float, float]]:
+        """Look up per-token prices for the comparison models once per analyzer."""
+        if self._comparison_prices is None:
+            litellm = _get_litellm()
 
-        # Common models to compare
-        models_to_compare = [
-            'gpt-4o-mini', 'gpt-4o', 'gpt-4-turbo',
-            'claude-3-haiku', 'claude-3-5-haiku', 'claude-3-5-sonnet', 'claude-3-opus'
-        ]
+            prices = {}
+            for model in COMPARISON_MODELS:
+                try:
+                    input_price, _ = litellm.cost_per_token(model=model, prompt_tokens=1, completion_tokens=0)
+                    _, output_price = litellm.cost_per_token(model=model, prompt_tokens=0, completion_tokens=1)
+                except Exception:
+                    # Skip models that don't have pricing data
+                    continue
+                prices[model] = (input_price, output_price)
+            self._comparison_prices = prices
+        return self._comparison_prices
 
+    def _compare_model_costs_litellm(self, input_tokens: int, output_tokens: int, current_cost: float) -> Dict:
+        """Compare costs across models using LiteLLM."""
         comparisons = {}
-        for model in models_to_compare:
-            try:
-                input_cost, output_cost = cost_per_token(
-                    model=model,
-                    prompt_tokens=input_tokens,
-                    completion_tokens=output_tokens
-                )
-                model_cost = input_cost + output_cost
-
-                comparisons[model] = {
-                    "total_cost": model_cost,
-                    "formatted_cost": self._format_cost(model_cost),
-                    "savings_vs_current": model_cost - current_cost,
-                    "percent_of_current": (model_cost / current_cost) * 100 if current_cost > 0 else 0
-                }
-            except:
-                # Skip models that don't have pricing data
-                continue
+        for model, (input_price, output_price) in self._get_comparison_prices().items():
+            model_cost = input_price * input_tokens + output_price * output_tokens
+
+            comparisons[model] = {
+                "total_cost": model_cost,
+                "formatted_cost": self._format_cost(model_cost),
+                "savings_vs_current": model_cost - current_cost,
+                "percent_of_current": (model_cost / current_cost) * 100 if current_cost > 0 else 0
+            }
 
         return comparisons
 
     def generate_markdown_report(self, classifications: List[Dict[str, Any]],
-                                run_metadata: Optional[Dict[str, Any]] = None) -> str:
+                                run_metadata: Optional[Dict[str, Any]] = None,
+                                *, precomputed: Optional[Dict[str, Any]] = None,
+                                intermediates: Optional[Dict[str, Any]] = None) -> str:
         """Generate comprehensive markdown report for human review."""
-
-        # Run all analyses
-        histogram = self.generate_assignment_histogram(classifications)
-        distribution = self.generate_category_distribution(classifications)
-        quality = self.generate_quality_metrics(classifications)
+        return "\n".join(self.iter_markdown_report(classifications, run_metadata, precomputed=precomputed,
+                                                   intermediates=intermediates))
+
+    def iter_markdown_report(self, classifications: List[Dict[str, Any]],
+                             run_metadata: Optional[Dict[str, Any]] = None,
+                             *, precomputed: Optional[Dict[str, Any]] = None,
+                             intermediates: Optional[Dict[str, Any]] = None) -> Iterator[str]:
+        """Yield the markdown report line by line (without line terminators).
+
+        precomputed may hold results from run_all_analyses for the same
+        classifications; those analyses are then not run again. Analyses
+        still to run share intermediates, aggregated here if not given.
+        """
+
+        # Reuse successful precomputed analyses, run the rest
+        report_analyses = {}
+        for analysis_name in ("assignment_histogram", "category_distribution", "quality_metrics"):
+            result = precomputed.get(analysis_name) if precomputed else None
+            if result is None or result.get("status") == "failed":
+                if intermediates is None:
+                    intermediates = aggregate_classifications(classifications)
+                result = self.available_analyses[analysis_name](classifications, intermediates)
+            report_analyses[analysis_name] = result
+        histogram = report_analyses["assignment_histogram"]
+        distribution = report_analyses["category_distribution"]
+        quality = report_analyses["quality_metrics"]
 
         # Try to get cost analysis if token usage available
         cost_analysis = None
@@ -372,11 +574,8 @@ class ClassificationAnalyzer:
                 except:
                     pass  # Cost analysis optional for markdown report
 
-        # Start building the report
-        report_lines = []
-
         # Header and Executive Summary
-        report_lines.extend([
+        yield from (
             "# Classification Analysis Report",
             "",
             "## Executive Summary",
@@ -386,17 +585,17 @@ class ClassificationAnalyzer:
             f"**Categories Utilized:** {distribution['summary']['total_categories']} main categories, {distribution['summary']['total_subcategories']} subcategories",
             f"**Top Category:** {distribution['summary']['top_category']} ({distribution['summary']['top_category_count']} products)",
             "",
-        ])
+        )
 
         # Add run metadata if available
         if run_metadata:
-            report_lines.extend([
+            yield from (
                 "### Run Information",
                 "",
                 f"- **Run ID:** {run_metadata.get('run_id', 'Unknown')}",
                 f"- **Duration:** {run_metadata.get('duration_seconds', 'Unknown')}s",
                 f"- **Timestamp:** {run_metadata.get('start_time', 'Unknown')}",
-            ])
+            )
 
             # Add cost information if available
             if cost_analysis and 'cost_breakdown' in cost_analysis:
@@ -404,44 +603,36 @@ class ClassificationAnalyzer:
                 model_used = cost_analysis.get('model_used', 'Unknown')
                 efficiency = cost_analysis.get('efficiency_metrics', {})
 
-                report_lines.extend([
+                yield from (
                     f"- **Model Used:** {model_used}",
                     f"- **Total Cost:** {cost_breakdown.get('formatted_total', 'Unknown')}",
                     f"- **Cost per Product:** {efficiency.get('cost_per_product', 0):.4f}",
-                ])
+                )
 
-            report_lines.append("")
+            yield ""
 
         # Assignment Quality Analysis
-        report_lines.extend([
+        yield from (
             "## Assignment Quality Analysis",
             "",
             "_This section shows how many category assignments each product received, indicating classification consistency._",
             "",
-        ])
+        )
 
         # Assignment histogram in markdown table
         hist_data = histogram['assignment_histogram']
-        report_lines.extend([
+        yield from (
             "| Assignments per Product | Product Count | Percentage | Quality Indicator |",
             "|------------------------|---------------|------------|-------------------|",
-        ])
-
-        for assignments, data in sorted(hist_data.items(), key=lambda x: int(x[0])):
-            assignments_num = int(assignments)
-            count = data['products']
-            percentage = data['percentage']
+        )
 
-            if assignments_num == 0:
-                quality_indicator = "⚠️ Failed Classification"
-            elif assignments_num == 1:
-                quality_indicator = "✅ Perfect Classification"
-            else:
-                quality_indicator = "🔄 Multiple Categories"
-
-            report_lines.append(f"| {assignments} | {count} | {percentage}% | {quality_indicator} |")
+        yield from (
+            f"| {assignments} | {data['products']} | {data['percentage']}% | "
+            f"{_QUALITY_INDICATORS.get(int(assignments), _MULTIPLE_ASSIGNMENTS_INDICATOR)} |"
+            for assignments, data in sorted(hist_data.items(), key=lambda x: int(x[0]))
+        )
 
-        report_lines.extend([
+        yield from (
             "",
             "### Key Quality Insights:",
             "",
@@ -449,16 +640,16 @@ class ClassificationAnalyzer:
             f"- **{histogram['summary']['multiple_assignments']} Products** received multiple category assignments (indicates overlapping health benefits)",
             f"- **{histogram['summary']['zero_assignments']} Products** failed to receive category assignments (requires investigation)",
             "",
-        ])
+        )
 
         # Show examples of multiple assignments if any
         if histogram['multi_assignment_examples']:
-            report_lines.extend([
+            yield from (
                 "### Products with Multiple Categories:",
                 "",
                 "_These products legitimately fit multiple health categories, indicating comprehensive health benefits._",
                 "",
-            ])
+            )
 
             for example in histogram['multi_assignment_examples'][:5]:  # Show top 5
                 assignments_str = ", ".join(example['assignments'])
@@ -466,76 +657,67 @@ class ClassificationAnalyzer:
                 product_ref = example.get('product_slug') or example['product_id']
                 if example.get('product_slug'):
                     product_link = f"[{product_ref}](https://rogueherbalist.com/product/{product_ref}/)"
-                    report_lines.append(f"- **{product_link}** (ID: {example['product_id']}): {assignments_str}")
+                    yield f"- **{product_link}** (ID: {example['product_id']}): {assignments_str}"
                 else:
-                    report_lines.append(f"- **Product {example['product_id']}:** {assignments_str}")
+                    yield f"- **Product {example['product_id']}:** {assignments_str}"
 
-            report_lines.extend(["", ""])
+            yield from ("", "")
 
         # Category Distribution Analysis
-        report_lines.extend([
+        yield from (
             "## Category Distribution Analysis",
             "",
             "_This section shows which health categories are most commonly represented in the product catalog._",
             "",
-        ])
+        )
 
         # Category distribution in the requested format
         cat_dist = distribution['category_distribution']
-        for category, data in cat_dist.items():
-            count = data['count']
-            percentage = data['percentage']
-            report_lines.append(f"**{category}:** {count} ({percentage}%)")
-
-            # Add subcategories with indentation
-            for subcategory, subdata in data['subcategories'].items():
-                subcount = subdata['count']
-                subpercentage = subdata['percentage']
-                report_lines.append(f"  {subcategory}: {subcount} ({subpercentage}%)")
+        yield from _category_lines(cat_dist)
 
-            report_lines.append("")  # Empty line between categories
+        # An empty run has no top category, so it takes no share
+        top_category = distribution['summary']['top_category']
+        top_category_pct = cat_dist[top_category]['percentage'] if top_category in cat_dist else 0
 
         # Business Insights
-        report_lines.extend([
+        yield from (
             "## Business Insights",
             "",
-        ])
+        )
 
         # Top categories analysis
-        top_categories = list(cat_dist.items())[:5]  # Top 5 categories
-        report_lines.extend([
+        # Top 5 categories (already sorted by count), without copying the rest
+        top_categories = islice(cat_dist.items(), 5)
+        yield from (
             "### Market Focus Areas:",
             "",
-        ])
+        )
 
         for i, (category, data) in enumerate(top_categories, 1):
             category_name = category.replace('-', ' ').title()
-            report_lines.append(f"{i}. **{category_name}** ({data['percentage']}% of catalog)")
+            yield f"{i}. **{category_name}** ({data['percentage']}% of catalog)"
 
             # Add business context based on category
-            if category == "immune-support":
-                report_lines.append("   - Strong focus on immune system health products")
-            elif category == "gut-health":
-                report_lines.append("   - Significant emphasis on digestive wellness")
-            elif category == "stress-mood-anxiety":
-                report_lines.append("   - Mental wellness and stress management focus")
-            elif category == "energy-vitality":
-                report_lines.append("   - Energy and vitality enhancement products")
-            else:
-                report_lines.append(f"   - Specialized health focus area")
+            yield f"   - {_BUSINESS_CONTEXT.get(category, _DEFAULT_BUSINESS_CONTEXT)}"
 
-        report_lines.extend([
+        yield from (
             "",
             "### Catalog Diversity:",
             "",
             f"- **{distribution['summary']['total_categories']} Main Categories:** Comprehensive health coverage",
             f"- **{distribution['summary']['total_subcategories']} Subcategories:** Detailed product specialization",
-            f"- **Balanced Distribution:** No single category dominates (top category: {distribution['summary']['top_category']} at {cat_dist[distribution['summary']['top_category']]['percentage']}%)",
+            f"- **Balanced Distribution:** No single category dominates (top category: {top_category} at {top_category_pct}%)",
             "",
-        ])
+        )
+
+        # Grade the consistency rate once for the metrics table and assessment
+        consistency_status, quality_assessment = next(
+            (status, assessment) for threshold, status, assessment in _CONSISTENCY_GRADES
+            if quality['consistency_rate'] >= threshold
+        )
 
         # Technical Quality Metrics
-        report_lines.extend([
+        yield from (
             "## Technical Quality Metrics",
             "",
             "_For QA and system monitoring purposes._",
@@ -546,109 +728,112 @@ class ClassificationAnalyzer:
             f"| Unique Products | {quality['unique_products']} | ✅ |",
             f"| Empty Categories | {quality['empty_categories']} | {'⚠️' if quality['empty_categories'] > 0 else '✅'} |",
             f"| Empty Subcategories | {quality['empty_subcategories']} | {'⚠️' if quality['empty_subcategories'] > 0 else '✅'} |",
-            f"| Consistency Rate | {quality['consistency_rate']}% | {'✅' if quality['consistency_rate'] >= 95 else '⚠️' if quality['consistency_rate'] >= 90 else '❌'} |",
+            f"| Consistency Rate | {quality['consistency_rate']}% | {consistency_status} |",
             "",
-        ])
+        )
 
         # Quality Assessment
-        if quality['consistency_rate'] >= 95:
-            quality_assessment = "🟢 **Excellent** - Classification system performing optimally"
-        elif quality['consistency_rate'] >= 90:
-            quality_assessment = "🟡 **Good** - Minor inconsistencies, monitoring recommended"
-        else:
-            quality_assessment = "🔴 **Needs Attention** - Classification inconsistencies require investigation"
-
-        report_lines.extend([
+        yield from (
             "### Overall Quality Assessment:",
             "",
             quality_assessment,
             "",
-        ])
+        )
 
         # Cost Analysis Section
         if cost_analysis and 'cost_breakdown' in cost_analysis:
-            report_lines.extend([
+            yield from (
                 "## Cost Analysis",
                 "",
                 "_Detailed breakdown of API costs based on current provider pricing._",
                 "",
-            ])
+            )
 
             cost_breakdown = cost_analysis['cost_breakdown']
             token_usage = cost_analysis.get('token_usage', {})
             pricing_info = cost_analysis.get('pricing_info', {})
 
             # Cost breakdown table
-            report_lines.extend([
+            yield from (
                 "| Cost Component | Tokens | Rate (per 1M) | Cost |",
                 "|----------------|--------|---------------|------|",
                 f"| Input Tokens | {token_usage.get('input_tokens', 0):,} | ${pricing_info.get('cost_per_1m_input', 0):.2f} | ${cost_breakdown.get('input_cost', 0):.4f} |",
                 f"| Output Tokens | {token_usage.get('output_tokens', 0):,} | ${pricing_info.get('cost_per_1m_output', 0):.2f} | ${cost_breakdown.get('output_cost', 0):.4f} |",
                 f"| **Total** | {token_usage.get('total_tokens', 0):,} | | **{cost_breakdown.get('formatted_total', '$0.00')}** |",
                 "",
-            ])
+            )
 
             # Efficiency metrics
             efficiency = cost_analysis.get('efficiency_metrics', {})
-            report_lines.extend([
+            yield from (
                 "### Cost Efficiency:",
                 "",
                 f"- **Cost per Product:** ${efficiency.get('cost_per_product', 0):.6f}",
                 f"- **Cost per 1,000 Products:** ${efficiency.get('cost_per_1k_products', 0):.3f}",
                 "",
-            ])
+            )
 
             # Model comparison if available
             if 'model_comparisons' in cost_analysis:
                 comparisons = cost_analysis['model_comparisons']
                 current_cost = cost_breakdown.get('total_cost', 0)
 
-                report_lines.extend([
+                yield from (
                     "### Model Cost Comparison:",
                     "",
                     "| Model | Total Cost | vs Current | Savings |",
                     "|-------|------------|------------|---------|",
-                ])
-
-                for model, comparison in sorted(comparisons.items(), key=lambda x: x[1]['total_cost']):
-                    savings = comparison['savings_vs_current']
-                    savings_text = f"+${abs(savings):.4f}" if savings > 0 else f"-${abs(savings):.4f}"
-                    percent = comparison['percent_of_current']
+                )
 
-                    report_lines.append(
-                        f"| {model} | {comparison['formatted_cost']} | {percent:.0f}% | {savings_text} |"
-                    )
+                yield from (
+                    f"| {model} | {comparison['formatted_cost']} | {comparison['percent_of_current']:.0f}% | "
+                    f"{'+' if comparison['savings_vs_current'] > 0 else '-'}${abs(comparison['savings_vs_current']):.4f} |"
+                    for model, comparison in sorted(comparisons.items(), key=lambda x: x[1]['total_cost'])
+                )
 
-                report_lines.extend(["", ""])
+                yield from ("", "")
 
         # Recommendations
-        report_lines.extend([
+        yield from (
             "## Recommendations",
             "",
-        ])
+        )
 
         if quality['empty_categories'] > 0:
-            report_lines.append(f"- **Address {quality['empty_categories']} products with missing categories** - Review classification logic")
+            yield f"- **Address {quality['empty_categories']} products with missing categories** - Review classification logic"
 
         if histogram['summary']['multiple_assignments'] > len(classifications) * 0.05:  # More than 5%
-            report_lines.append(f"- **Review {histogram['summary']['multiple_assignments']} products with multiple assignments** - Ensure categorization precision")
+            yield f"- **Review {histogram['summary']['multiple_assignments']} products with multiple assignments** - Ensure categorization precision"
 
         if quality['consistency_rate'] < 95:
-            report_lines.append("- **Improve classification consistency** - Current rate below 95% threshold")
+            yield "- **Improve classification consistency** - Current rate below 95% threshold"
 
         # Business recommendations
-        top_category_pct = cat_dist[distribution['summary']['top_category']]['percentage']
         if top_category_pct > 30:
-            report_lines.append(f"- **Consider catalog diversification** - {distribution['summary']['top_category']} represents {top_category_pct}% of products")
+            yield f"- **Consider catalog diversification** - {top_category} represents {top_category_pct}% of products"
 
-        report_lines.extend([
+        yield from (
             "",
             "---",
             "",
             f"*Report generated on {datetime.now().strftime('%Y-%m-%d at %H:%M:%S')} using Analysis Engine v{self.analysis_version}*"
-        ])
+        )
 
-        return "\n".join(report_lines)
+
+def load_classifications_stream(run_dir: Path) -> Iterator[Dict[str, Any]]:
+    """Yield classification results from a run directory one row at a time.
+
+    Slug and product id values are interned: they come from a small
+    vocabulary, so rows share one string per distinct value and the
+    analyzer's Counters hash each value once.
+    """
+    with open(run_dir / "outputs" / "classifications.csv", 'r', newline='') as f:
+        for row in csv.DictReader(f):
+            for field in _INTERNED_FIELDS:
+                value = row.get(field)
+                if value:
+                    row[field] = sys.intern(value)
+            yield row
 
 
 def load_classifications_from_run(run_dir: Path) -> Optional[List[Dict[str, Any]]]:
@@ -658,44 +843,47 @@ def load_classifications_from_run(run_dir: Path) -> Optional[List[Dict[str, Any]
     if not classifications_file.exists():
         return None
 
-    import csv
-    classifications = []
-
-    with open(classifications_file, 'r') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            classifications.append(dict(row))
-
-    return classifications
+    return list(load_classifications_stream(run_dir))
 
 
 def save_analysis_results(run_dir: Path, analysis_results: Dict[str, Any],
                          analysis_suffix: str = "",
                          classifications: Optional[List[Dict[str, Any]]] = None,
-                         run_metadata: Optional[Dict[str, Any]] = None) -> None:
-    """Save analysis results to run directory."""
+                         run_metadata: Optional[Dict[str, Any]] = None,
+                         analyzer: Optional[ClassificationAnalyzer] = None,
+                         write_individual: bool = True) -> None:
+    """Save analysis results to run directory.
+
+    Pass the analyzer that produced analysis_results so the markdown
+    report carries its version. With write_individual=False only the
+    combined file is written, not one JSON file per analysis.
+    """
     outputs_dir = run_dir / "outputs"
     outputs_dir.mkdir(exist_ok=True)
 
-    # Save individual analysis files
-    for analysis_name, analysis_data in analysis_results.items():
-        if analysis_name == "analysis_metadata":
-            continue
+    # Serialize each analysis once, for its own file and the combined file
+    sections = {name: _dump_json(data) for name, data in analysis_results.items()}
 
-        filename = f"{analysis_name}{analysis_suffix}.json"
-        with open(outputs_dir / filename, "w") as f:
-            json.dump(analysis_data, f, indent=2)
+    # Save individual analysis files
+    if write_individual:
+        for analysis_name, section in sections.items():
+            if analysis_name != "analysis_metadata":
+                _write_bytes(outputs_dir / f"{analysis_name}{analysis_suffix}.json", section)
 
     # Save combined analysis results
     combined_filename = f"combined_analysis{analysis_suffix}.json"
-    with open(outputs_dir / combined_filename, "w") as f:
-        json.dump(analysis_results, f, indent=2)
+    _write_combined_json(outputs_dir / combined_filename, sections)
 
-    # Generate and save markdown report if classifications provided
-    if classifications:
-        analyzer = ClassificationAnalyzer()
-        markdown_report = analyzer.generate_markdown_report(classifications, run_metadata)
+    # Generate and save markdown report if classifications provided, even
+    # an empty list, so a run that classified nothing still gets its report
+    if classifications is not None:
+        if analyzer is None:
+            analyzer = ClassificationAnalyzer()
+        report_lines = analyzer.iter_markdown_report(classifications, run_metadata,
+                                                     precomputed=analysis_results)
 
+        # Stream lines to disk, newline-separated as in generate_markdown_report
         markdown_filename = f"classification_report{analysis_suffix}.md"
-        with open(outputs_dir / markdown_filename, "w") as f:
-            f.write(markdown_report)
\ No newline at end of file
+        with open(outputs_dir / markdown_filename, "w", buffering=_WRITE_BUFFER_SIZE) as f:
+            f.write(next(report_lines))
+            f.writelines("\n" + line for line in report_lines)
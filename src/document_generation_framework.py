@@ -7,16 +7,102 @@ Shared infrastructure for document generation use cases including:
 - Base experimental runner for document generation
 """
 
+import hashlib
+import functools
+import heapq
+import io
 import json
-import xml.etree.ElementTree as ET
+import os
+import sys
+import time
+from collections import Counter
 from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
-from typing import Dict, Any, List, Optional, Tuple
+from types import MappingProxyType
+from typing import Dict, Any, List, Mapping, Optional, Tuple, Union
 import difflib
 import re
 
+try:
+    from lxml import etree as ET
+    LXML_AVAILABLE = True
+    XMLParseError = ET.XMLSyntaxError
+except ImportError:
+    import xml.etree.ElementTree as ET
+    LXML_AVAILABLE = False
+    XMLParseError = ET.ParseError
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# lxml parser options for untrusted XML: internal entities are expanded as
+# xml.etree does, external ones and network access are refused
+_LXML_SAFE_OPTIONS = {"resolve_entities": "internal", "no_network": True, "huge_tree": False}
+
+
+def _xml_source(content: Union[str, bytes]) -> Tuple[bytes, Optional[str]]:
+    """Return the bytes to parse and the encoding to force on the parser.
+
+    A str is parsed as UTF-8 whatever its XML declaration says; bytes
+    follow their own declaration.
+    """
+    if isinstance(content, bytes):
+        return content, None
+    return content.encode("utf-8"), "utf-8"
+
+
+def parse_xml(content: Union[str, bytes]):
+    """Parse an XML document and return its root element.
+
+    Uses lxml when available. Its parser is set up to behave like
+    xml.etree here: comments and processing instructions are dropped,
+    internal entities are expanded, and a str is parsed as UTF-8. External
+    entities are never loaded and nothing is fetched over the network,
+    since the content may come from an LLM.
+    """
+    if LXML_AVAILABLE:
+        data, encoding = _xml_source(content)
+        parser = ET.XMLParser(remove_comments=True, remove_pis=True, encoding=encoding, **_LXML_SAFE_OPTIONS)
+        return ET.fromstring(data, parser)
+    return ET.fromstring(content)
+
+
+def iterparse_xml(content: Union[str, bytes], events: Tuple[str, ...]):
+    """Iterate (event, element) pairs over an XML document.
+
+    Parser settings match parse_xml.
+    """
+    data, encoding = _xml_source(content)
+    source = io.BytesIO(data)
+    if LXML_AVAILABLE:
+        return ET.iterparse(source, events=events, remove_comments=True, remove_pis=True, encoding=encoding,
+                            **_LXML_SAFE_OPTIONS)
+    return ET.iterparse(source, events=events, parser=ET.XMLParser(encoding=encoding))
+
+
+# Every <taxon> below the root; lxml compiles the path once as an XPath
+if LXML_AVAILABLE:
+    _find_taxons = ET.XPath(".//taxon")
+else:
+    def _find_taxons(root):
+        return root.findall(".//taxon")
+
+
+def _dump_json(data: Any) -> bytes:
+    """Serialize data as indented JSON, using orjson when available."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2).encode("utf-8")
+
+
+# & that is NOT followed by common entity names
+_AMP_RE = re.compile(r'&(?!(amp|lt|gt|quot|apos|#\d+|#x[0-9a-fA-F]+);)')
+
 
 class DocumentFormat(Enum):
     """Supported document formats."""
@@ -28,6 +114,47 @@ class DocumentFormat(Enum):
     TEXT = "text"
 
 
+# Validation results kept, keyed by check and a digest of the content
+VALIDATION_CACHE_SIZE = 256
+
+
+class _ContentDigest:
+    """lru_cache argument that hashes and compares by a digest of the content."""
+
+    __slots__ = ("digest", "content")
+
+    def __init__(self, content: str):
+        self.digest = hashlib.blake2b(content.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+        self.content = content
+
+    def __hash__(self) -> int:
+        return hash(self.digest)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, _ContentDigest) and self.digest == other.digest
+
+
+@functools.lru_cache(maxsize=VALIDATION_CACHE_SIZE)
+def _validation_result(validate, document: _ContentDigest) -> Any:
+    return validate(document.content)
+
+
+def _cached_validation(content: str, validate) -> Any:
+    """Return validate(content), reusing the result for content seen recently.
+
+    Cached results are shared between callers and must be immutable.
+    """
+    if not isinstance(content, str):
+        return validate(content)
+
+    document = _ContentDigest(content)
+    try:
+        return _validation_result(validate, document)
+    finally:
+        # The cache keeps the digest, not the document
+        document.content = None
+
+
 class DocumentValidator:
     """Generic document validation for various formats."""
 
@@ -36,13 +163,20 @@ class DocumentValidator:
         """
         Validate XML syntax and well-formedness.
 
+        Results are cached by a digest of the content, so re-validating the
+        same document (e.g. after a retry) does not parse it again.
+
         Returns:
             (is_valid, error_message)
         """
+        return _cached_validation(content, DocumentValidator._check_xml)
+
+    @staticmethod
+    def _check_xml(content: str) -> Tuple[bool, str]:
         try:
-            ET.fromstring(content)
+            parse_xml(content)
             return True, ""
-        except ET.ParseError as e:
+        except XMLParseError as e:
             return False, f"XML parsing error: {str(e)}"
         except Exception as e:
             return False, f"Unexpected error: {str(e)}"
@@ -52,9 +186,15 @@ class DocumentValidator:
         """
         Validate JSON syntax.
 
+        Cached like validate_xml.
+
         Returns:
             (is_valid, error_message)
         """
+        return _cached_validation(content, DocumentValidator._check_json)
+
+    @staticmethod
+    def _check_json(content: str) -> Tuple[bool, str]:
         try:
             json.loads(content)
             return True, ""
@@ -106,23 +246,58 @@ class DocumentValidator:
         - Valid <taxon> elements with slugs
         - Title elements present
 
+        Cached like validate_xml, through inspect_taxonomy.
+
         Returns:
             (is_valid, error_message)
         """
-        # First check basic XML validity
-        is_valid, error = DocumentValidator.validate_xml(xml_content)
-        if not is_valid:
-            return is_valid, error
+        return DocumentValidator.inspect_taxonomy(xml_content)[1]
 
+    @staticmethod
+    def inspect_taxonomy(xml_content: str) -> Tuple[Tuple[bool, str], Tuple[bool, str], Optional[Mapping[str, int]]]:
+        """
+        Parse a taxonomy once and run every XML check on the same tree.
+
+        Cached like validate_xml.
+
+        Returns:
+            (xml_result, structure_result, taxon_counts) where the results match
+            validate_xml and validate_taxonomy_structure, and taxon_counts is a
+            read-only mapping of total/primary/subcategory counts (None if the
+            XML does not parse)
+        """
+        return _cached_validation(xml_content, DocumentValidator._inspect_taxonomy)
+
+    @staticmethod
+    def _inspect_taxonomy(xml_content: str):
         try:
-            root = ET.fromstring(xml_content)
+            root = parse_xml(xml_content)
+        except XMLParseError as e:
+            error = (False, f"XML parsing error: {str(e)}")
+            return error, error, None
+        except Exception as e:
+            error = (False, f"Unexpected error: {str(e)}")
+            return error, error, None
+
+        taxons = _find_taxons(root)
+        primary = subcategory = 0
+        for taxon in taxons:
+            taxon_type = taxon.get('type')
+            if taxon_type == 'primary':
+                primary += 1
+            elif taxon_type == 'subcategory':
+                subcategory += 1
+        taxon_counts = MappingProxyType({"total": len(taxons), "primary": primary, "subcategory": subcategory})
+        return (True, ""), DocumentValidator._check_taxonomy_structure(root, taxons), taxon_counts
 
+    @staticmethod
+    def _check_taxonomy_structure(root, taxons: List[Any]) -> Tuple[bool, str]:
+        try:
             # Check root element
             if root.tag != "taxonomy":
                 return False, "Root element must be <taxonomy>"
 
             # Check for taxon elements
-            taxons = root.findall(".//taxon")
             if len(taxons) == 0:
                 return False, "No <taxon> elements found"
 
@@ -143,13 +318,72 @@ class DocumentValidator:
             return False, f"Structure validation error: {str(e)}"
 
 
-@dataclass
+# Above these sizes diff_text skips difflib, whose matching can take
+# tens of seconds on large or repetitive inputs
+MAX_DIFF_LINES = 5000
+MAX_DIFF_CHARS = 2 * 1024 * 1024
+
+
+def _unmatched_lines(lines: List[str], other_lines: List[str]) -> List[str]:
+    """Lines of lines left over after pairing each with an equal line of other_lines."""
+    remaining = Counter(other_lines)
+    unmatched = []
+    for line in lines:
+        if remaining[line]:
+            remaining[line] -= 1
+        else:
+            unmatched.append(line)
+    return unmatched
+
+
+def _format_range_unified(start: int, stop: int) -> str:
+    """Convert a line range to the unified diff "start,length" format, as difflib does."""
+    beginning = start + 1
+    length = stop - start
+    if length == 1:
+        return f"{beginning}"
+    if not length:
+        beginning -= 1
+    return f"{beginning},{length}"
+
+
+def _unified_diff_lines(matcher: difflib.SequenceMatcher, fromfile: str, tofile: str,
+                        context: int = 3) -> List[str]:
+    """Lines of difflib.unified_diff(..., lineterm="") built from an existing matcher."""
+    a, b = matcher.a, matcher.b
+    lines = []
+    for group in matcher.get_grouped_opcodes(context):
+        if not lines:
+            lines.append(f"--- {fromfile}")
+            lines.append(f"+++ {tofile}")
+        first, last = group[0], group[-1]
+        lines.append(f"@@ -{_format_range_unified(first[1], last[2])} "
+                     f"+{_format_range_unified(first[3], last[4])} @@")
+        for tag, i1, i2, j1, j2 in group:
+            if tag == 'equal':
+                lines.extend(' ' + line for line in a[i1:i2])
+                continue
+            if tag in ('replace', 'delete'):
+                lines.extend('-' + line for line in a[i1:i2])
+            if tag in ('replace', 'insert'):
+                lines.extend('+' + line for line in b[j1:j2])
+    return lines
+
+
+@dataclass(slots=True)
 class DocumentDiff:
-    """Container for document diff results."""
+    """Container for document diff results.
+
+    stats["approximate"] is True when the documents were too large for a
+    line diff (see MAX_DIFF_LINES). added_lines and removed_lines then
+    come from matching lines regardless of order: a moved line counts as
+    no change, where the ordered diff counts one deletion and one
+    addition. unified_diff is empty in that case.
+    """
     added_lines: List[str]
     removed_lines: List[str]
     modified_sections: List[Dict[str, Any]]
-    stats: Dict[str, int]
+    stats: Dict[str, Any]
     unified_diff: str
 
 
@@ -170,30 +404,38 @@ class DocumentDiffer:
         before_lines = before.splitlines(keepends=True)
         after_lines = after.splitlines(keepends=True)
 
-        # Generate unified diff
-        unified = difflib.unified_diff(
-            before_lines,
-            after_lines,
-            fromfile="before",
-            tofile="after",
-            lineterm=""
-        )
-        unified_diff = "\n".join(unified)
-
-        # Analyze changes
-        differ = difflib.Differ()
-        diff = list(differ.compare(before_lines, after_lines))
-
-        added = [line[2:] for line in diff if line.startswith('+ ')]
-        removed = [line[2:] for line in diff if line.startswith('- ')]
+        coarse = (max(len(before_lines), len(after_lines)) > MAX_DIFF_LINES
+                  or len(before) + len(after) > MAX_DIFF_CHARS)
+
+        if coarse:
+            # Too large for sequence matching: compare line counts only
+            added = _unmatched_lines(after_lines, before_lines)
+            removed = _unmatched_lines(before_lines, after_lines)
+            unified_diff = ""
+        else:
+            # One matching pass gives both the counts and the unified diff.
+            # autojunk is off so repeated lines such as closing tags can
+            # still be matched as unchanged in long documents
+            matcher = difflib.SequenceMatcher(None, before_lines, after_lines, autojunk=False)
+            added = []
+            removed = []
+            for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+                if tag in ('replace', 'delete'):
+                    removed.extend(before_lines[i1:i2])
+                if tag in ('replace', 'insert'):
+                    added.extend(after_lines[j1:j2])
+            unified_diff = "\n".join(_unified_diff_lines(matcher, "before", "after"))
 
         stats = {
             "total_changes": len(added) + len(removed),
             "additions": len(added),
             "deletions": len(removed),
             "before_lines": len(before_lines),
-            "after_lines": len(after_lines)
+            "after_lines": len(after_lines),
+            "approximate": coarse
         }
+        if coarse:
+            stats["note"] = "Documents too large for a line diff; lines compared as multisets"
 
         return DocumentDiff(
             added_lines=added,
@@ -215,22 +457,12 @@ class DocumentDiffer:
             Dictionary with structured diff information
         """
         try:
-            before_root = ET.fromstring(before)
-            after_root = ET.fromstring(after)
+            before_root = parse_xml(before)
+            after_root = parse_xml(after)
 
             # Extract all element paths
-            def get_element_paths(root, prefix=""):
-                paths = {}
-                for child in root:
-                    path = f"{prefix}/{child.tag}"
-                    if "slug" in child.attrib:
-                        path += f"[@slug='{child.attrib['slug']}']"
-                    paths[path] = ET.tostring(child, encoding='unicode')
-                    paths.update(get_element_paths(child, path))
-                return paths
-
-            before_paths = get_element_paths(before_root)
-            after_paths = get_element_paths(after_root)
+            before_paths = self._element_signatures(before_root)
+            after_paths = self._element_signatures(after_root)
 
             # Find differences
             before_keys = set(before_paths.keys())
@@ -259,7 +491,7 @@ class DocumentDiffer:
                 "stats": stats
             }
 
-        except ET.ParseError:
+        except XMLParseError:
             # Fall back to text diff if XML parsing fails
             text_diff = self.diff_text(before, after)
             return {
@@ -270,6 +502,115 @@ class DocumentDiffer:
                 "note": "XML parsing failed, using text diff"
             }
 
+    @staticmethod
+    def _element_signatures(root) -> Dict[str, bytes]:
+        """
+        Map the path of every element below root to a digest of its subtree.
+
+        Two subtrees get the same digest exactly when they serialize the
+        same (tag, attributes, text, tail and children). Each digest is built
+        from the children's digests, so every element is hashed once instead
+        of re-serializing its whole subtree. When several elements share a
+        path, the last one in document order wins.
+        """
+        # Walk the tree once in document order, building paths from the parent's
+        # and recording each element's children by their position in nodes
+        nodes = []
+        stack = [(root, "", None)]
+        while stack:
+            elem, path, parent = stack.pop()
+            position = None
+            if elem is not root:
+                position = len(nodes)
+                nodes.append((elem, path, []))
+                if parent is not None:
+                    nodes[parent][2].append(position)
+            children = []
+            for child in elem:
+                child_path = f"{path}/{child.tag}"
+                if "slug" in child.attrib:
+                    child_path += f"[@slug='{child.attrib['slug']}']"
+                children.append((child, child_path, position))
+            stack.extend(reversed(children))
+
+        # Children follow their parent in document order, so hash in reverse
+        digests = [b""] * len(nodes)
+        for position in range(len(nodes) - 1, -1, -1):
+            elem, _, children = nodes[position]
+            signature = (
+                elem.tag,
+                tuple(elem.attrib.items()),
+                elem.text or "",
+                elem.tail or "",
+                tuple(digests[child] for child in children)
+            )
+            digests[position] = hashlib.blake2b(repr(signature).encode("utf-8"), digest_size=16).digest()
+
+        return {path: digests[position] for position, (_, path, _) in enumerate(nodes)}
+
+    def _extract_taxons(self, xml_content: str) -> Dict[str, Dict[str, Any]]:
+        """
+        Extract every taxon's properties in one streaming parse.
+
+        Taxons are keyed by slug in document order. Each taxon's direct
+        children are scanned once for title/description/ingredients, and
+        the element is cleared once read.
+        """
+        taxons = {}
+        open_taxons = []  # Entries of taxons being parsed, innermost last
+        root = None
+
+        for event, elem in iterparse_xml(xml_content, ("start", "end")):
+            if root is None:
+                root = elem
+            # Like findall(".//taxon"): every taxon below the root
+            if elem.tag != "taxon" or elem is root:
+                continue
+
+            if event == "start":
+                # Register on start so nested taxons follow their parent; the
+                # type is interned so all taxons share one string per value
+                taxon_type = elem.get('type')
+                if taxon_type is not None:
+                    taxon_type = sys.intern(taxon_type)
+                entry = {'slug': elem.get('slug'), 'type': taxon_type}
+                taxons[entry['slug']] = entry
+                open_taxons.append(entry)
+                continue
+
+            title = description = ingredients = None
+            for child in elem:
+                tag = child.tag
+                if tag == 'title':
+                    title = child if title is None else title
+                elif tag == 'description':
+                    description = child if description is None else description
+                elif tag == 'ingredients':
+                    ingredients = child if ingredients is None else ingredients
+
+            common_count = other_count = 0
+            if ingredients is not None:
+                # Same elements as findall('.//common/item') and './/other/item'
+                for group in ingredients.iter():
+                    if group is ingredients or group.tag not in ('common', 'other'):
+                        continue
+                    items = sum(1 for item in group if item.tag == 'item')
+                    if group.tag == 'common':
+                        common_count += items
+                    else:
+                        other_count += items
+
+            open_taxons.pop().update({
+                'title': title.text if title is not None else '',
+                'description': description.text if description is not None else '',
+                'has_ingredients': ingredients is not None,
+                'common_count': common_count,
+                'other_count': other_count
+            })
+            elem.clear()
+
+        return taxons
+
     def analyze_taxonomy_changes(self, before: str, after: str) -> Dict[str, Any]:
         """
         Deep analysis of taxonomy changes with categorization and impact assessment.
@@ -281,37 +622,9 @@ class DocumentDiffer:
         Returns:
             Dictionary with detailed change analysis
         """
-        import xml.etree.ElementTree as ET
-
         try:
-            before_root = ET.fromstring(before)
-            after_root = ET.fromstring(after)
-
-            # Extract all taxons with their properties
-            def extract_taxons(root):
-                taxons = {}
-                for taxon in root.findall(".//taxon"):
-                    slug = taxon.attrib.get('slug')
-                    taxon_type = taxon.attrib.get('type')
-
-                    # Extract all sub-elements
-                    title = taxon.find('title')
-                    description = taxon.find('description')
-                    ingredients = taxon.find('ingredients')
-
-                    taxons[slug] = {
-                        'slug': slug,
-                        'type': taxon_type,
-                        'title': title.text if title is not None else '',
-                        'description': description.text if description is not None else '',
-                        'has_ingredients': ingredients is not None,
-                        'common_count': len(ingredients.findall('.//common/item')) if ingredients is not None else 0,
-                        'other_count': len(ingredients.findall('.//other/item')) if ingredients is not None else 0
-                    }
-                return taxons
-
-            before_taxons = extract_taxons(before_root)
-            after_taxons = extract_taxons(after_root)
+            before_taxons = self._extract_taxons(before)
+            after_taxons = self._extract_taxons(after)
 
             # Categorize changes
             changes = {
@@ -330,70 +643,76 @@ class DocumentDiffer:
             changes['new_taxons'] = list(after_slugs - before_slugs)
             changes['removed_taxons'] = list(before_slugs - after_slugs)
 
-            # Analyze modifications
-            for slug in before_slugs & after_slugs:
-                before_taxon = before_taxons[slug]
-                after_taxon = after_taxons[slug]
-
-                # Check description changes
-                if before_taxon['description'] != after_taxon['description']:
-                    desc_change = {
-                        'slug': slug,
-                        'type': after_taxon['type'],
-                        'title': after_taxon['title'],
-                        'before_length': len(before_taxon['description']),
-                        'after_length': len(after_taxon['description']),
-                        'change_magnitude': len(after_taxon['description']) - len(before_taxon['description'])
-                    }
-                    changes['modified_descriptions'].append(desc_change)
-
-                # Check ingredient additions
-                if not before_taxon['has_ingredients'] and after_taxon['has_ingredients']:
-                    ingredient_change = {
-                        'slug': slug,
-                        'type': after_taxon['type'],
-                        'title': after_taxon['title'],
-                        'common_count': after_taxon['common_count'],
-                        'other_count': after_taxon['other_count'],
-                        'total_ingredients': after_taxon['common_count'] + after_taxon['other_count']
-                    }
-                    changes['added_ingredients'].append(ingredient_change)
-
-                # Check title changes
-                if before_taxon['title'] != after_taxon['title']:
-                    changes['modified_titles'].append({
-                        'slug': slug,
-                        'before': before_taxon['title'],
-                        'after': after_taxon['title']
-                    })
-
             # Generate category-level stats
-            for slug in after_taxons:
-                taxon = after_taxons[slug]
+            stats_by_category = changes['stats_by_category']
+            # Categories grouped by the first segment of their slug; a changed
+            # subcategory counts toward every category whose prefix starts its slug
+            prefix_to_categories = {}
+            for slug, taxon in after_taxons.items():
                 if taxon['type'] == 'primary':
-                    if slug not in changes['stats_by_category']:
-                        changes['stats_by_category'][slug] = {
-                            'title': taxon['title'],
-                            'subcategories_modified': 0,
-                            'total_ingredients': 0,
-                            'description_changed': False
-                        }
-
-                    # Check if this category's description changed
-                    if slug in before_taxons:
-                        if before_taxons[slug]['description'] != taxon['description']:
-                            changes['stats_by_category'][slug]['description_changed'] = True
-
-                    # Count ingredients
-                    changes['stats_by_category'][slug]['total_ingredients'] = taxon['common_count'] + taxon['other_count']
+                    stats_by_category[slug] = {
+                        'title': taxon['title'],
+                        'subcategories_modified': 0,
+                        'total_ingredients': taxon['common_count'] + taxon['other_count'],
+                        'description_changed': (
+                            slug in before_taxons and before_taxons[slug]['description'] != taxon['description']
+                        )
+                    }
+                    if slug is not None:
+                        prefix_to_categories.setdefault(slug.split('-')[0], []).append(slug)
+            prefix_lengths = sorted({len(prefix) for prefix in prefix_to_categories})
+
+            # Analyze modifications
+            shared = [(slug, before_taxons[slug], after_taxons[slug]) for slug in before_slugs & after_slugs]
+
+            # Check description changes
+            changes['modified_descriptions'] = [
+                {
+                    'slug': slug,
+                    'type': after_taxon['type'],
+                    'title': after_taxon['title'],
+                    'before_length': len(before_taxon['description']),
+                    'after_length': len(after_taxon['description']),
+                    'change_magnitude': len(after_taxon['description']) - len(before_taxon['description'])
+                }
+                for slug, before_taxon, after_taxon in shared
+                if before_taxon['description'] != after_taxon['description']
+            ]
+
+            # Check ingredient additions
+            changes['added_ingredients'] = [
+                {
+                    'slug': slug,
+                    'type': after_taxon['type'],
+                    'title': after_taxon['title'],
+                    'common_count': after_taxon['common_count'],
+                    'other_count': after_taxon['other_count'],
+                    'total_ingredients': after_taxon['common_count'] + after_taxon['other_count']
+                }
+                for slug, before_taxon, after_taxon in shared
+                if not before_taxon['has_ingredients'] and after_taxon['has_ingredients']
+            ]
+
+            # Check title changes
+            changes['modified_titles'] = [
+                {
+                    'slug': slug,
+                    'before': before_taxon['title'],
+                    'after': after_taxon['title']
+                }
+                for slug, before_taxon, after_taxon in shared
+                if before_taxon['title'] != after_taxon['title']
+            ]
 
             # Count subcategory modifications per category
             for change in changes['modified_descriptions']:
                 if change['type'] == 'subcategory':
-                    # Find parent category
-                    for cat_slug in changes['stats_by_category']:
-                        if change['slug'].startswith(cat_slug.split('-')[0]):
-                            changes['stats_by_category'][cat_slug]['subcategories_modified'] += 1
+                    slug = change['slug']
+                    for length in prefix_lengths:
+                        if length > len(slug):
+                            break
+                        for cat_slug in prefix_to_categories.get(slug[:length], ()):
+                            stats_by_category[cat_slug]['subcategories_modified'] += 1
 
             return changes
 
@@ -413,7 +732,7 @@ class DocumentDiffer:
         Returns:
             Markdown-formatted diff report
         """
-        report = f"""# Document Diff Report
+        parts = [f"""# Document Diff Report
 
 ## Summary Statistics
 
@@ -422,11 +741,11 @@ class DocumentDiffer:
 - **Deletions**: {diff['stats'].get('deletions', 0)}
 - **Modifications**: {diff['stats'].get('modifications', 0)}
 
-"""
+"""]
 
         # Add detailed analysis if provided
         if detailed_changes and 'error' not in detailed_changes:
-            report += f"""## Change Analysis
+            parts.append(f"""## Change Analysis
 
 ### Overview
 - **New Taxons**: {len(detailed_changes.get('new_taxons', []))}
@@ -434,43 +753,43 @@ class DocumentDiffer:
 - **Modified Descriptions**: {len(detailed_changes.get('modified_descriptions', []))}
 - **Taxons with Added Ingredients**: {len(detailed_changes.get('added_ingredients', []))}
 
-"""
+""")
 
             # Top categories by change volume
             if detailed_changes.get('stats_by_category'):
-                report += "### Categories Ranked by Changes\n\n"
-                sorted_cats = sorted(
+                parts.append("### Categories Ranked by Changes\n\n")
+                top_cats = heapq.nlargest(
+                    10,  # Top 10
                     detailed_changes['stats_by_category'].items(),
-                    key=lambda x: (x[1]['subcategories_modified'], x[1]['total_ingredients']),
-                    reverse=True
+                    key=lambda x: (x[1]['subcategories_modified'], x[1]['total_ingredients'])
                 )
 
-                for slug, stats in sorted_cats[:10]:  # Top 10
-                    report += f"**{stats['title']}** (`{slug}`)\n"
+                for slug, stats in top_cats:
+                    parts.append(f"**{stats['title']}** (`{slug}`)\n")
                     if stats['description_changed']:
-                        report += f"  - ✏️ Description enhanced\n"
-                    report += f"  - 📝 {stats['subcategories_modified']} subcategories modified\n"
-                    report += f"  - 🌿 {stats['total_ingredients']} total ingredients added\n\n"
+                        parts.append(f"  - ✏️ Description enhanced\n")
+                    parts.append(f"  - 📝 {stats['subcategories_modified']} subcategories modified\n")
+                    parts.append(f"  - 🌿 {stats['total_ingredients']} total ingredients added\n\n")
 
             # Description changes with largest magnitude
             if detailed_changes.get('modified_descriptions'):
-                report += "\n### Largest Description Enhancements\n\n"
-                sorted_desc = sorted(
+                parts.append("\n### Largest Description Enhancements\n\n")
+                top_desc = heapq.nlargest(
+                    15,  # Top 15
                     detailed_changes['modified_descriptions'],
-                    key=lambda x: abs(x['change_magnitude']),
-                    reverse=True
+                    key=lambda x: abs(x['change_magnitude'])
                 )
 
-                for change in sorted_desc[:15]:  # Top 15
+                for change in top_desc:
                     change_type = "expanded" if change['change_magnitude'] > 0 else "condensed"
-                    report += f"**{change['title']}** (`{change['slug']}`)\n"
-                    report += f"  - Type: {change['type']}\n"
-                    report += f"  - {change['before_length']} → {change['after_length']} characters ({change_type})\n"
-                    report += f"  - Change: {abs(change['change_magnitude'])} characters\n\n"
+                    parts.append(f"**{change['title']}** (`{change['slug']}`)\n")
+                    parts.append(f"  - Type: {change['type']}\n")
+                    parts.append(f"  - {change['before_length']} → {change['after_length']} characters ({change_type})\n")
+                    parts.append(f"  - Change: {abs(change['change_magnitude'])} characters\n\n")
 
             # Ingredient additions
             if detailed_changes.get('added_ingredients'):
-                report += "\n### Ingredient Lists Added\n\n"
+                parts.append("\n### Ingredient Lists Added\n\n")
                 sorted_ingredients = sorted(
                     detailed_changes['added_ingredients'],
                     key=lambda x: x['total_ingredients'],
@@ -478,38 +797,42 @@ class DocumentDiffer:
                 )
 
                 for change in sorted_ingredients:
-                    report += f"**{change['title']}** (`{change['slug']}`)\n"
-                    report += f"  - Common ingredients: {change['common_count']}\n"
-                    report += f"  - Other ingredients: {change['other_count']}\n"
-                    report += f"  - **Total: {change['total_ingredients']} ingredients**\n\n"
+                    parts.append(f"**{change['title']}** (`{change['slug']}`)\n")
+                    parts.append(f"  - Common ingredients: {change['common_count']}\n")
+                    parts.append(f"  - Other ingredients: {change['other_count']}\n")
+                    parts.append(f"  - **Total: {change['total_ingredients']} ingredients**\n\n")
 
         # Standard diff sections
         if format_type == DocumentFormat.XML:
             if diff.get('added_nodes'):
-                report += "\n## Technical Changes: Added Nodes\n\n"
-                report += f"Total: {len(diff['added_nodes'])} nodes\n\n"
+                parts.append("\n## Technical Changes: Added Nodes\n\n")
+                parts.append(f"Total: {len(diff['added_nodes'])} nodes\n\n")
                 for node in diff['added_nodes'][:20]:  # Limit to first 20
-                    report += f"- `{node}`\n"
+                    parts.append(f"- `{node}`\n")
                 if len(diff['added_nodes']) > 20:
-                    report += f"\n... and {len(diff['added_nodes']) - 20} more\n"
+                    parts.append(f"\n... and {len(diff['added_nodes']) - 20} more\n")
 
             if diff.get('removed_nodes'):
-                report += "\n## Technical Changes: Removed Nodes\n\n"
-                report += f"Total: {len(diff['removed_nodes'])} nodes\n\n"
+                parts.append("\n## Technical Changes: Removed Nodes\n\n")
+                parts.append(f"Total: {len(diff['removed_nodes'])} nodes\n\n")
                 for node in diff['removed_nodes'][:20]:
-                    report += f"- `{node}`\n"
+                    parts.append(f"- `{node}`\n")
                 if len(diff['removed_nodes']) > 20:
-                    report += f"\n... and {len(diff['removed_nodes']) - 20} more\n"
+                    parts.append(f"\n... and {len(diff['removed_nodes']) - 20} more\n")
 
             if diff.get('modified_nodes'):
-                report += "\n## Technical Changes: Modified Nodes\n\n"
-                report += f"Total: {len(diff['modified_nodes'])} nodes\n\n"
+                parts.append("\n## Technical Changes: Modified Nodes\n\n")
+                parts.append(f"Total: {len(diff['modified_nodes'])} nodes\n\n")
                 for node in diff['modified_nodes'][:20]:
-                    report += f"- `{node}`\n"
+                    parts.append(f"- `{node}`\n")
                 if len(diff['modified_nodes']) > 20:
-                    report += f"\n... and {len(diff['modified_nodes']) - 20} more\n"
+                    parts.append(f"\n... and {len(diff['modified_nodes']) - 20} more\n")
+
+        return "".join(parts)
 
-        return report
+
+# Standard layout of every run directory
+RUN_SUBDIRECTORIES = ("inputs", "config", "outputs", "metadata")
 
 
 class DocumentGenerationRunner:
@@ -528,6 +851,7 @@ class DocumentGenerationRunner:
         self.validator = DocumentValidator()
         self.differ = DocumentDiffer()
         self.start_time = datetime.now()
+        self._start_counter = time.perf_counter()
         self.run_id = f"{use_case}-{self.start_time.strftime('%Y-%m-%d-%H%M%S')}"
         self.run_dir = Path("runs") / self.run_id
 
@@ -536,13 +860,14 @@ class DocumentGenerationRunner:
 
     def setup_run_directory(self):
         """Create standardized run directory structure."""
-        self.run_dir.mkdir(parents=True, exist_ok=True)
+        os.makedirs(self.run_dir, exist_ok=True)
 
         # Create subdirectories
-        (self.run_dir / "inputs").mkdir(exist_ok=True)
-        (self.run_dir / "config").mkdir(exist_ok=True)
-        (self.run_dir / "outputs").mkdir(exist_ok=True)
-        (self.run_dir / "metadata").mkdir(exist_ok=True)
+        for subdir in RUN_SUBDIRECTORIES:
+            try:
+                os.mkdir(self.run_dir / subdir)
+            except FileExistsError:
+                pass
 
         print(f"📁 Run directory created: {self.run_dir}")
 
@@ -574,32 +899,29 @@ class DocumentGenerationRunner:
         # Fix common XML issues
         if self.format == DocumentFormat.XML:
             # Replace unescaped ampersands with &amp; (but not already-escaped ones)
-            import re
-            # Match & that is NOT followed by common entity names
-            cleaned = re.sub(r'&(?!(amp|lt|gt|quot|apos|#\d+|#x[0-9a-fA-F]+);)', '&amp;', cleaned)
+            cleaned = _AMP_RE.sub('&amp;', cleaned)
 
         return cleaned
 
-    def save_input(self, filename: str, content: str):
-        """Save input file to run directory."""
+    def save_input(self, filename: str, content: Union[str, bytes]):
+        """Save input file to run directory (text is written as UTF-8)."""
         path = self.run_dir / "inputs" / filename
-        path.write_text(content)
+        path.write_bytes(content.encode("utf-8") if isinstance(content, str) else content)
 
-    def save_output(self, filename: str, content: str):
-        """Save output file to run directory."""
+    def save_output(self, filename: str, content: Union[str, bytes]):
+        """Save output file to run directory (text is written as UTF-8)."""
         path = self.run_dir / "outputs" / filename
-        path.write_text(content)
+        path.write_bytes(content.encode("utf-8") if isinstance(content, str) else content)
 
     def save_config(self, config_data: Dict[str, Any]):
         """Save configuration to run directory."""
         path = self.run_dir / "config" / "run_config.json"
-        with open(path, "w") as f:
-            json.dump(config_data, f, indent=2)
+        path.write_bytes(_dump_json(config_data))
 
     def finalize_run(self, success: bool = True, error: str = None):
         """Finalize run with metadata."""
         end_time = datetime.now()
-        duration = (end_time - self.start_time).total_seconds()
+        duration = time.perf_counter() - self._start_counter
 
         metadata = {
             "run_id": self.run_id,
@@ -611,8 +933,7 @@ class DocumentGenerationRunner:
             "error": error
         }
 
-        with open(self.run_dir / "metadata" / "run_summary.json", "w") as f:
-            json.dump(metadata, f, indent=2)
+        (self.run_dir / "metadata" / "run_summary.json").write_bytes(_dump_json(metadata))
 
         status_icon = "✅" if success else "❌"
         print(f"{status_icon} Run {'completed' if success else 'failed'} in {duration:.1f}s: {self.run_dir}")
@@ -628,46 +949,38 @@ class DocumentGenerationRunner:
         Returns:
             Markdown-formatted validation report
         """
-        report = f"""# Validation Report
+        parts = [f"""# Validation Report
 
 ## Document Format: {format_type.value.upper()}
 
-"""
+"""]
 
         if format_type == DocumentFormat.XML:
-            is_valid, error = self.validator.validate_xml(content)
-            report += f"### XML Well-Formedness\n"
-            report += f"- **Status**: {'✅ Valid' if is_valid else '❌ Invalid'}\n"
+            # One parse serves the well-formedness, structure and statistics sections
+            (is_valid, error), (is_valid_tax, error_tax), taxon_counts = self.validator.inspect_taxonomy(content)
+            parts.append(f"### XML Well-Formedness\n")
+            parts.append(f"- **Status**: {'✅ Valid' if is_valid else '❌ Invalid'}\n")
             if error:
-                report += f"- **Error**: {error}\n"
+                parts.append(f"- **Error**: {error}\n")
 
             # Additional taxonomy-specific validation
             if is_valid:
-                is_valid_tax, error_tax = self.validator.validate_taxonomy_structure(content)
-                report += f"\n### Taxonomy Structure\n"
-                report += f"- **Status**: {'✅ Valid' if is_valid_tax else '❌ Invalid'}\n"
+                parts.append(f"\n### Taxonomy Structure\n")
+                parts.append(f"- **Status**: {'✅ Valid' if is_valid_tax else '❌ Invalid'}\n")
                 if error_tax:
-                    report += f"- **Error**: {error_tax}\n"
+                    parts.append(f"- **Error**: {error_tax}\n")
 
                 # Count elements
-                try:
-                    root = ET.fromstring(content)
-                    taxons = root.findall(".//taxon")
-                    report += f"\n### Statistics\n"
-                    report += f"- **Total Taxons**: {len(taxons)}\n"
-
-                    primary = [t for t in taxons if t.attrib.get('type') == 'primary']
-                    subcategory = [t for t in taxons if t.attrib.get('type') == 'subcategory']
-                    report += f"- **Primary Categories**: {len(primary)}\n"
-                    report += f"- **Subcategories**: {len(subcategory)}\n"
-                except:
-                    pass
+                parts.append(f"\n### Statistics\n")
+                parts.append(f"- **Total Taxons**: {taxon_counts['total']}\n")
+                parts.append(f"- **Primary Categories**: {taxon_counts['primary']}\n")
+                parts.append(f"- **Subcategories**: {taxon_counts['subcategory']}\n")
 
         elif format_type == DocumentFormat.JSON:
             is_valid, error = self.validator.validate_json(content)
-            report += f"### JSON Syntax\n"
-            report += f"- **Status**: {'✅ Valid' if is_valid else '❌ Invalid'}\n"
+            parts.append(f"### JSON Syntax\n")
+            parts.append(f"- **Status**: {'✅ Valid' if is_valid else '❌ Invalid'}\n")
             if error:
-                report += f"- **Error**: {error}\n"
+                parts.append(f"- **Error**: {error}\n")
 
-        return report
+        return "".join(parts)
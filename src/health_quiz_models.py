@@ -5,11 +5,16 @@ This module contains data structures shared between health_quiz_use_case.py
 and product_recommendation_engine.py to avoid circular imports.
 """
 
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 from typing import Any, Dict, List, Optional
 
 
-@dataclass
+def _copy_list(value: Any) -> Any:
+    """Shallow-copy lists so dicts built by to_dict don't alias the model."""
+    return list(value) if isinstance(value, list) else value
+
+
+@dataclass(slots=True)
 class HealthQuizInput:
     """Input data structure for health quiz."""
     health_issue_description: str  # Free text description of health issue
@@ -47,7 +52,12 @@ class HealthQuizInput:
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary, filtering None values."""
-        return {k: v for k, v in asdict(self).items() if v is not None}
+        data = {}
+        for name in self.__slots__:
+            value = getattr(self, name)
+            if value is not None:
+                data[name] = _copy_list(value)
+        return data
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'HealthQuizInput':
@@ -55,7 +65,7 @@ class HealthQuizInput:
         return cls(**data)
 
 
-@dataclass
+@dataclass(slots=True)
 class ProductRecommendation:
     """Individual product recommendation."""
     product_id: str
@@ -67,8 +77,21 @@ class ProductRecommendation:
     rationale: str  # Why it's recommended
     ingredient_highlights: List[str]  # Key beneficial ingredients
 
-
-@dataclass
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary."""
+        return {
+            "product_id": self.product_id,
+            "title": self.title,
+            "description": self.description,
+            "category": self.category,
+            "relevance_score": self.relevance_score,
+            "purchase_link": self.purchase_link,
+            "rationale": self.rationale,
+            "ingredient_highlights": _copy_list(self.ingredient_highlights)
+        }
+
+
+@dataclass(slots=True)
 class HealthQuizOutput:
     """Output data structure for health quiz recommendations."""
     general_recommendations: List[str]  # LLM-generated health advice
@@ -84,4 +107,13 @@ class HealthQuizOutput:
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for API response."""
-        return asdict(self)
+        return {
+            "general_recommendations": _copy_list(self.general_recommendations),
+            "specific_products": [product.to_dict() for product in self.specific_products],
+            "educational_content": _copy_list(self.educational_content),
+            "lifestyle_suggestions": _copy_list(self.lifestyle_suggestions),
+            "follow_up_questions": _copy_list(self.follow_up_questions),
+            "primary_categories_addressed": _copy_list(self.primary_categories_addressed),
+            "confidence_score": self.confidence_score,
+            "consultation_recommended": self.consultation_recommended
+        }
@@ -6,7 +6,9 @@ and receive personalized recommendations including Rogue Herbalist products.
 """
 
 import json
-from datetime import datetime
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, List, Optional, Tuple
 from pathlib import Path
 
@@ -14,6 +16,80 @@ from use_case_framework import RealtimeUseCase, UseCaseResult, register_use_case
 from health_quiz_models import HealthQuizInput, ProductRecommendation, HealthQuizOutput
 from product_recommendation_engine import ProductRecommendationEngine
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Health categories a quiz may select from
+# (would come from the taxonomy file; a fixed list for now)
+HEALTH_CATEGORIES: Tuple[str, ...] = (
+    "immune_support", "digestive_health", "stress_relief",
+    "sleep_support", "joint_health", "cardiovascular_health",
+    "respiratory_health", "skin_health", "cognitive_support",
+    "energy_vitality", "women_health", "men_health",
+    "detox_cleanse", "weight_management", "anti_aging",
+    "inflammation", "mood_emotional", "liver_support",
+    "kidney_health", "hormonal_balance"
+)
+HEALTH_CATEGORIES_SET = frozenset(HEALTH_CATEGORIES)
+
+# Keywords in the health issue description that warrant a professional consultation
+CONCERNING_TERMS = ("pain", "severe", "chronic", "medication", "doctor")
+
+# Fixed text before and after the customer details in the recommendation prompt
+_PROMPT_HEADER = """You are a knowledgeable herbalist and wellness advisor for Rogue Herbalist, a company specializing in high-quality herbal products.
+
+A customer has provided the following information about their health concerns:
+
+"""
+
+_PROMPT_FOOTER = """
+Based on this information, please provide personalized recommendations in the following JSON format:
+
+{
+    "general_advice": [
+        "Evidence-based general health advice point 1",
+        "Evidence-based general health advice point 2",
+        "Evidence-based general health advice point 3"
+    ],
+    "herbal_categories": [
+        "Category 1 of herbs that might be helpful",
+        "Category 2 of herbs that might be helpful"
+    ],
+    "lifestyle_suggestions": [
+        "Dietary suggestion 1",
+        "Exercise/lifestyle suggestion 2",
+        "Stress management suggestion 3"
+    ],
+    "follow_up_questions": [
+        "Question to help them think deeper about their health",
+        "Question about potential underlying causes"
+    ],
+    "consultation_needed": false,
+    "reasoning": "Brief explanation of the recommendations"
+}
+
+Guidelines:
+- Provide evidence-based, safe recommendations
+- Never diagnose or replace medical advice
+- Suggest professional consultation for serious conditions
+- Focus on herbal and natural approaches
+- Be specific and actionable
+- Consider what they've already tried to avoid repetition
+"""
+
+def _parse_json(text: str) -> Any:
+    """Parse a JSON document, using orjson when available.
+
+    orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers catch
+    the same exception either way.
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.loads(text)
+    return json.loads(text)
+
 
 @register_use_case("health_quiz")
 class HealthQuizUseCase(RealtimeUseCase):
@@ -21,8 +97,15 @@ class HealthQuizUseCase(RealtimeUseCase):
 
     def __init__(self, config):
         super().__init__(config)
-        self.taxonomy_categories = self._load_health_categories()
+        self.taxonomy_categories = list(HEALTH_CATEGORIES)  # public, stays a list for existing callers
+        self._taxonomy_set = HEALTH_CATEGORIES_SET
         self.product_catalog = self._load_product_catalog()
+        # Built on first use and reused so the catalog is loaded once per use case
+        self._recommendation_engine: Optional[ProductRecommendationEngine] = None
+        # Builds the engine while the first request waits on the LLM; created
+        # on first use and shut down by close()
+        self._engine_executor: Optional[ThreadPoolExecutor] = None
+        self._engine_lock = threading.Lock()
 
     def get_use_case_name(self) -> str:
         return "health_quiz"
@@ -32,7 +115,25 @@ class HealthQuizUseCase(RealtimeUseCase):
         try:
             # Convert to structured input for validation
             quiz_input = HealthQuizInput.from_dict(input_data)
+        except Exception as e:
+            return False, f"Input validation error: {str(e)}"
+        return self._validate(quiz_input)
+
+    def validate_and_process(self, input_data: Dict[str, Any]) -> Tuple[Optional[str], Optional[UseCaseResult]]:
+        """Validate and process health quiz input, parsing it only once."""
+        try:
+            quiz_input = HealthQuizInput.from_dict(input_data)
+        except Exception as e:
+            return f"Input validation error: {str(e)}", None
 
+        is_valid, error_message = self._validate(quiz_input)
+        if not is_valid:
+            return error_message, None
+        return None, self.process_request(input_data, quiz_input=quiz_input)
+
+    def _validate(self, quiz_input: HealthQuizInput) -> Tuple[bool, Optional[str]]:
+        """Validate already-parsed health quiz input."""
+        try:
             # Check required fields
             if not quiz_input.health_issue_description:
                 return False, "health_issue_description is required"
@@ -43,7 +144,7 @@ class HealthQuizUseCase(RealtimeUseCase):
             # Validate health categories if provided
             if quiz_input.primary_health_areas:
                 for area in quiz_input.primary_health_areas:
-                    if area not in self.taxonomy_categories:
+                    if area not in self._taxonomy_set:
                         return False, f"Invalid primary_health_area: {area}"
 
             # Validate severity level if provided
@@ -56,19 +157,35 @@ class HealthQuizUseCase(RealtimeUseCase):
         except Exception as e:
             return False, f"Input validation error: {str(e)}"
 
-    def process_request(self, input_data: Dict[str, Any]) -> UseCaseResult:
-        """Process health quiz request."""
-        start_time = datetime.now()
+    def process_request(self,
+                        input_data: Dict[str, Any],
+                        quiz_input: Optional[HealthQuizInput] = None) -> UseCaseResult:
+        """Process health quiz request.
+
+        Args:
+            input_data: Raw quiz input
+            quiz_input: input_data already parsed by the caller, if available
+        """
+        start = time.perf_counter()
 
         try:
             # Extract UTM medium for tracking (optional, used for email/web tracking)
             utm_medium = input_data.get('utm_medium', None)
 
-            # Parse input
-            quiz_input = HealthQuizInput.from_dict(input_data)
-
-            # Generate LLM-based recommendations
-            llm_recommendations = self._generate_llm_recommendations(quiz_input)
+            # Parse input unless the caller already did
+            if quiz_input is None:
+                quiz_input = HealthQuizInput.from_dict(input_data)
+
+            # Generate LLM-based recommendations. The LLM call is network-bound
+            # and the first recommendation engine loads the catalog from disk;
+            # neither needs the other, so build the engine on a worker thread
+            # while waiting on the LLM
+            if self.llm_client and self._recommendation_engine is None:
+                engine_future = self._get_engine_executor().submit(self._get_recommendation_engine)
+                llm_recommendations = self._generate_llm_recommendations(quiz_input)
+                engine_future.result()
+            else:
+                llm_recommendations = self._generate_llm_recommendations(quiz_input)
 
             # Find relevant products with optional UTM tracking
             product_recommendations = self._find_relevant_products(
@@ -92,15 +209,16 @@ class HealthQuizUseCase(RealtimeUseCase):
                 consultation_recommended=self._should_recommend_consultation(quiz_input)
             )
 
-            processing_time = (datetime.now() - start_time).total_seconds()
+            processing_time = time.perf_counter() - start
 
+            areas = quiz_input.primary_health_areas
             return self.create_result(
                 success=True,
                 data=output.to_dict(),
                 metadata={
                     "input_summary": {
-                        "primary_areas": quiz_input.primary_health_areas,
-                        "areas_count": len(quiz_input.primary_health_areas) if quiz_input.primary_health_areas else 0,
+                        "primary_areas": areas,
+                        "areas_count": len(areas) if areas else 0,
                         "has_tried_something": bool(quiz_input.tried_already),
                     },
                     "recommendations_count": len(product_recommendations),
@@ -110,7 +228,7 @@ class HealthQuizUseCase(RealtimeUseCase):
             )
 
         except Exception as e:
-            processing_time = (datetime.now() - start_time).total_seconds()
+            processing_time = time.perf_counter() - start
             return self.create_result(
                 success=False,
                 data={},
@@ -120,68 +238,30 @@ class HealthQuizUseCase(RealtimeUseCase):
 
     def get_prompt_template(self, context: Dict[str, Any]) -> str:
         """Get the LLM prompt template for health quiz."""
-        quiz_input = HealthQuizInput.from_dict(context)
-
-        template = f"""You are a knowledgeable herbalist and wellness advisor for Rogue Herbalist, a company specializing in high-quality herbal products.
+        return self._build_prompt(HealthQuizInput.from_dict(context))
 
-A customer has provided the following information about their health concerns:
-
-Health Issue: {quiz_input.health_issue_description}
-
-"""
+    def _build_prompt(self, quiz_input: HealthQuizInput) -> str:
+        """Build the LLM prompt from already-parsed quiz input."""
+        parts = [_PROMPT_HEADER, f"Health Issue: {quiz_input.health_issue_description}\n\n"]
 
         if quiz_input.tried_already:
-            template += f"What they've tried before: {quiz_input.tried_already}\n\n"
+            parts.append(f"What they've tried before: {quiz_input.tried_already}\n\n")
 
         if quiz_input.primary_health_areas:
             if len(quiz_input.primary_health_areas) == 1:
-                template += f"Primary health focus: {quiz_input.primary_health_areas[0]}\n"
+                parts.append(f"Primary health focus: {quiz_input.primary_health_areas[0]}\n")
             else:
-                template += f"Primary health focuses: {', '.join(quiz_input.primary_health_areas)}\n"
-                template += f"(User selected {len(quiz_input.primary_health_areas)} related health areas)\n"
+                parts.append(f"Primary health focuses: {', '.join(quiz_input.primary_health_areas)}\n")
+                parts.append(f"(User selected {len(quiz_input.primary_health_areas)} related health areas)\n")
 
         if quiz_input.age_range:
-            template += f"Age range: {quiz_input.age_range}\n"
+            parts.append(f"Age range: {quiz_input.age_range}\n")
 
         if quiz_input.severity_level:
-            template += f"Severity level (1-10): {quiz_input.severity_level}\n"
-
-        template += f"""
-Based on this information, please provide personalized recommendations in the following JSON format:
-
-{{
-    "general_advice": [
-        "Evidence-based general health advice point 1",
-        "Evidence-based general health advice point 2",
-        "Evidence-based general health advice point 3"
-    ],
-    "herbal_categories": [
-        "Category 1 of herbs that might be helpful",
-        "Category 2 of herbs that might be helpful"
-    ],
-    "lifestyle_suggestions": [
-        "Dietary suggestion 1",
-        "Exercise/lifestyle suggestion 2",
-        "Stress management suggestion 3"
-    ],
-    "follow_up_questions": [
-        "Question to help them think deeper about their health",
-        "Question about potential underlying causes"
-    ],
-    "consultation_needed": false,
-    "reasoning": "Brief explanation of the recommendations"
-}}
-
-Guidelines:
-- Provide evidence-based, safe recommendations
-- Never diagnose or replace medical advice
-- Suggest professional consultation for serious conditions
-- Focus on herbal and natural approaches
-- Be specific and actionable
-- Consider what they've already tried to avoid repetition
-"""
+            parts.append(f"Severity level (1-10): {quiz_input.severity_level}\n")
 
-        return template
+        parts.append(_PROMPT_FOOTER)
+        return "".join(parts)
 
     def _generate_llm_recommendations(self, quiz_input: HealthQuizInput) -> Dict[str, Any]:
         """Generate recommendations using LLM with structured JSON output."""
@@ -200,7 +280,7 @@ Guidelines:
                 "reasoning": "General wellness approach recommended"
             }
 
-        prompt = self.get_prompt_template(quiz_input.to_dict())
+        prompt = self._build_prompt(quiz_input)
         messages = [{"role": "user", "content": prompt}]
 
         try:
@@ -211,7 +291,7 @@ Guidelines:
             )
 
             # Parse JSON response - should be clean JSON with response_format
-            parsed_response = json.loads(response)
+            parsed_response = _parse_json(response)
             return parsed_response
 
         except json.JSONDecodeError as e:
@@ -225,7 +305,7 @@ Guidelines:
                     if len(lines) > 2 and lines[-1].strip() == '```':
                         cleaned_response = '\n'.join(lines[1:-1])
 
-                parsed_response = json.loads(cleaned_response)
+                parsed_response = _parse_json(cleaned_response)
                 return parsed_response
 
             except Exception as fallback_error:
@@ -261,19 +341,11 @@ Guidelines:
             llm_recommendations: LLM-generated recommendations for context
             utm_medium: Optional UTM medium for tracking ('email' or 'web'), None disables UTM
         """
-        # Initialize the product recommendation engine
-        # Use client_id from config, default to 'rogue_herbalist'
-        client_id = getattr(self.config, 'client_id', 'rogue_herbalist')
-
         # Get max_recommendations from use case config
         max_recs = self.config.use_case_config.get('max_recommendations', 5) if hasattr(self.config, 'use_case_config') else 5
         min_threshold = self.config.use_case_config.get('min_relevance_score', 0.3) if hasattr(self.config, 'use_case_config') else 0.3
 
-        engine = ProductRecommendationEngine(
-            client_id=client_id,
-            catalog_path=None,  # Uses default catalog path
-            config=self.config.use_case_config if hasattr(self.config, 'use_case_config') else {}
-        )
+        engine = self._get_recommendation_engine()
 
         # Get recommendations from engine with optional UTM tracking
         return engine.recommend_products(
@@ -284,6 +356,36 @@ Guidelines:
             utm_medium=utm_medium
         )
 
+    def _get_recommendation_engine(self) -> ProductRecommendationEngine:
+        """Return the product recommendation engine, creating it on first use."""
+        engine = self._recommendation_engine
+        if engine is None:
+            with self._engine_lock:
+                # Another thread may have built it while we waited
+                if self._recommendation_engine is None:
+                    # Use client_id from config, default to 'rogue_herbalist'
+                    self._recommendation_engine = ProductRecommendationEngine(
+                        client_id=getattr(self.config, 'client_id', 'rogue_herbalist'),
+                        catalog_path=None,  # Uses default catalog path
+                        config=self.config.use_case_config if hasattr(self.config, 'use_case_config') else {}
+                    )
+                engine = self._recommendation_engine
+        return engine
+
+    def _get_engine_executor(self) -> ThreadPoolExecutor:
+        """Return the executor that builds the recommendation engine, creating it on first use."""
+        with self._engine_lock:
+            if self._engine_executor is None:
+                self._engine_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="health-quiz-engine")
+            return self._engine_executor
+
+    def close(self) -> None:
+        """Shut down the engine-building thread, if one was started."""
+        with self._engine_lock:
+            executor, self._engine_executor = self._engine_executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
     def _generate_educational_content(self, quiz_input: HealthQuizInput) -> List[str]:
         """Generate educational content based on health areas."""
         content = []
@@ -307,8 +409,9 @@ Guidelines:
 
     def _extract_categories(self, quiz_input: HealthQuizInput) -> List[str]:
         """Extract health categories being addressed."""
-        if quiz_input.primary_health_areas:
-            return list(quiz_input.primary_health_areas)  # Return copy of the list
+        areas = quiz_input.primary_health_areas
+        if areas:
+            return list(areas)  # Return copy of the list
         return []
 
     def _calculate_confidence_score(self,
@@ -318,9 +421,10 @@ Guidelines:
         score = 0.5  # Base score
 
         # Increase confidence with more information
-        if quiz_input.primary_health_areas:
+        areas = quiz_input.primary_health_areas
+        if areas:
             # More areas selected = higher confidence in understanding user's needs
-            score += 0.15 + (0.05 * min(len(quiz_input.primary_health_areas), 3))
+            score += 0.15 + (0.05 * min(len(areas), 3))
         if quiz_input.tried_already:
             score += 0.1
         if quiz_input.severity_level:
@@ -333,28 +437,16 @@ Guidelines:
     def _should_recommend_consultation(self, quiz_input: HealthQuizInput) -> bool:
         """Determine if professional consultation should be recommended."""
         # Recommend consultation for high severity or certain keywords
-        if quiz_input.severity_level and quiz_input.severity_level >= 8:
+        severity = quiz_input.severity_level
+        if severity and severity >= 8:
             return True
 
         # Check for concerning keywords
-        concerning_terms = ["pain", "severe", "chronic", "medication", "doctor"]
         description_lower = quiz_input.health_issue_description.lower()
-
-        return any(term in description_lower for term in concerning_terms)
-
-    def _load_health_categories(self) -> List[str]:
-        """Load available health categories from taxonomy."""
-        # This would load from the actual taxonomy file
-        # For now, return a mock list
-        return [
-            "immune_support", "digestive_health", "stress_relief",
-            "sleep_support", "joint_health", "cardiovascular_health",
-            "respiratory_health", "skin_health", "cognitive_support",
-            "energy_vitality", "women_health", "men_health",
-            "detox_cleanse", "weight_management", "anti_aging",
-            "inflammation", "mood_emotional", "liver_support",
-            "kidney_health", "hormonal_balance"
-        ]
+        for term in CONCERNING_TERMS:
+            if term in description_lower:
+                return True
+        return False
 
     def _load_product_catalog(self) -> List[Dict[str, Any]]:
         """Load product catalog for recommendations."""
@@ -106,6 +106,9 @@ Examples:
 
   # Save with custom suffix
   python src/reanalyze_assign_cat.py --latest --suffix "_v2"
+
+  # Skip the per-analysis JSON files
+  python src/reanalyze_assign_cat.py --latest --combined-only
         """
     )
 
@@ -120,6 +123,8 @@ Examples:
                        help="Suffix to add to analysis output files")
     parser.add_argument("--version", default="1.0",
                        help="Analysis engine version to use")
+    parser.add_argument("--combined-only", action="store_true",
+                       help="Write only combined_analysis.json, not one JSON file per analysis")
 
     args = parser.parse_args()
 
@@ -183,7 +188,8 @@ Examples:
             pass
 
     # Save results including markdown report
-    save_analysis_results(run_dir, analysis_results, args.suffix, classifications, run_metadata)
+    save_analysis_results(run_dir, analysis_results, args.suffix, classifications, run_metadata, analyzer,
+                          write_individual=not args.combined_only)
 
     # Report results
     successful_analyses = []
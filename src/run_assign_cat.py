@@ -19,7 +19,7 @@ sys.path.insert(0, str(Path(__file__).parent))
 from llm_client import LLMClient
 from product_processor import Product, ProductCatalogReader, BatchProcessor
 from model_config import get_config_manager
-from analysis_engine import ClassificationAnalyzer
+from analysis_engine import ClassificationAnalyzer, save_analysis_results
 
 class RunManager:
     """Manages experimental runs with complete artifact capture."""
@@ -220,20 +220,8 @@ class RunManager:
             "model_used": model_used
         }
 
-        # Generate and save markdown report
-        markdown_report = analyzer.generate_markdown_report(classifications, run_metadata)
-        with open(self.run_dir / "outputs" / "classification_report.md", "w") as f:
-            f.write(markdown_report)
-
-        # Save individual analysis files for backward compatibility
-        for analysis_name, analysis_data in analysis_results.items():
-            if analysis_name != "analysis_metadata":
-                with open(self.run_dir / "outputs" / f"{analysis_name}.json", "w") as f:
-                    json.dump(analysis_data, f, indent=2)
-
-        # Save combined analysis results
-        with open(self.run_dir / "outputs" / "combined_analysis.json", "w") as f:
-            json.dump(analysis_results, f, indent=2)
+        # Save per-analysis JSON, combined analysis and markdown report
+        save_analysis_results(self.run_dir, analysis_results, "", classifications, run_metadata, analyzer)
 
         print(f"📤 Outputs saved: {len(assigned)} assigned, {len(unassigned)} unassigned")
 
@@ -614,6 +602,10 @@ Match the product_id from each product. No headers, no explanations."""
         "batch_prompt_template": batch_prompt_template
     }
 
+    # The system message (with the full taxonomy) is identical for every
+    # batch, so build it once and share it across requests
+    system_message = {"role": "system", "content": system_prompt}
+
     # Process products in batches
     classifications = []
     errors = []
@@ -626,10 +618,10 @@ Match the product_id from each product. No headers, no explanations."""
 
         try:
             # Format batch prompt
-            products_text = "\n\n".join([
+            products_text = "\n\n".join(
                 f"Product ID: {p.id}\nTitle: {p.title}\nDescription: {p.description[:500]}"  # Limit description length
                 for p in batch
-            ])
+            )
 
             user_prompt = batch_prompt_template.format(
                 count=len(batch),
@@ -637,7 +629,7 @@ Match the product_id from each product. No headers, no explanations."""
             )
 
             messages = [
-                {"role": "system", "content": system_prompt},
+                system_message,
                 {"role": "user", "content": user_prompt}
             ]
 
@@ -699,15 +691,8 @@ Match the product_id from each product. No headers, no explanations."""
     # Post-process: validate and correct slugs
     print("\n🔍 Validating and correcting slugs...")
 
-    # Extract taxonomy slugs for validation
-    import xml.etree.ElementTree as ET
-    tree = ET.parse(taxonomy_path)
-    root = tree.getroot()
-    taxonomy_slugs = set()
-    for taxon in root.findall('.//taxon'):
-        slug = taxon.get('slug')
-        if slug:
-            taxonomy_slugs.add(slug)
+    # Taxonomy slugs for validation, from the tree already parsed for the prompt
+    taxonomy_slugs = set(valid_slugs)
 
     # Save raw classifications before correction
     raw_classifications = [c.copy() for c in classifications]
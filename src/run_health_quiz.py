@@ -791,6 +791,9 @@ def process_health_quiz(quiz_input: HealthQuizInput,
             errors
         )
 
+    finally:
+        use_case.close()
+
 
 def load_persona(persona_name: str) -> tuple[HealthQuizInput, str, Optional[Dict[str, Any]]]:
     """
@@ -103,6 +103,25 @@ class UseCase(ABC):
         """Process a single request for this use case."""
         pass
 
+    def validate_and_process(self, input_data: Dict[str, Any]) -> tuple[Optional[str], Optional[UseCaseResult]]:
+        """
+        Validate input data and process it if valid.
+
+        Use cases that parse their input can override this to parse it once
+        for both steps.
+
+        Returns:
+            (error_message, None) for invalid input, otherwise (None, result)
+        """
+        is_valid, error_message = self.validate_input(input_data)
+        if not is_valid:
+            return error_message, None
+        return None, self.process_request(input_data)
+
+    def close(self) -> None:
+        """Release resources held by the use case. Safe to call more than once."""
+        pass
+
     @abstractmethod
     def get_prompt_template(self, context: Dict[str, Any]) -> str:
         """Get the LLM prompt template for this use case."""
@@ -349,9 +368,12 @@ class UseCaseManager:
             # Create use case instance
             use_case = self.create_use_case(client_id, use_case_name, custom_config)
 
-            # Validate input
-            is_valid, error_message = use_case.validate_input(input_data)
-            if not is_valid:
+            # Validate input and execute use case; the instance is not reused
+            try:
+                error_message, result = use_case.validate_and_process(input_data)
+            finally:
+                use_case.close()
+            if result is None:
                 return use_case.create_result(
                     False,
                     {},
@@ -359,8 +381,6 @@ class UseCaseManager:
                     (datetime.now() - start_time).total_seconds()
                 )
 
-            # Execute use case
-            result = use_case.process_request(input_data)
             result.processing_time = (datetime.now() - start_time).total_seconds()
 
             return result
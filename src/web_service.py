@@ -584,7 +584,10 @@ async def process_health_quiz_webhook(email: str, health_issue: str,
 
         # Process through framework
         start_time = time.time()
-        result = use_case.process_request(quiz_input_dict)
+        try:
+            result = use_case.process_request(quiz_input_dict)
+        finally:
+            use_case.close()
         processing_time = time.time() - start_time
 
         if not result.success:
@@ -0,0 +1,331 @@
+"""
+Unit tests for ClassificationAnalyzer.
+
+Tests histogram, distribution, and quality analyses over classification rows.
+"""
+
+import json
+from types import SimpleNamespace
+
+import pytest
+from src import analysis_engine
+from src.analysis_engine import (
+    ClassificationAnalyzer,
+    aggregate_classifications,
+    load_classifications_from_run,
+    load_classifications_stream,
+    save_analysis_results
+)
+
+
+@pytest.fixture
+def classifications():
+    """Classification rows as loaded from classifications.csv."""
+    return [
+        {'product_id': '1', 'category_slug': 'immune-support', 'sub_category_slug': 'mushroom-immune', 'slug': ''},
+        {'product_id': '1', 'category_slug': 'gut-health', 'sub_category_slug': '', 'slug': 'four-mushroom'},
+        {'product_id': '2', 'category_slug': 'immune-support', 'sub_category_slug': 'mushroom-immune'},
+        {'product_id': '3', 'category_slug': 'immune-support', 'sub_category_slug': 'cold-flu'},
+        {'product_id': ' 3 ', 'category_slug': 'stress-mood-anxiety', 'sub_category_slug': 'sleep'},
+        {'product_id': '3', 'category_slug': 'gut-health', 'sub_category_slug': 'digestion'},
+        {'product_id': '', 'category_slug': '', 'sub_category_slug': ''},
+    ]
+
+
+@pytest.fixture
+def analyzer():
+    return ClassificationAnalyzer()
+
+
+class TestAssignmentHistogram:
+    """Test assignments-per-product histogram."""
+
+    def test_histogram_counts(self, analyzer, classifications):
+        """Test products are bucketed by assignment count."""
+        result = analyzer.generate_assignment_histogram(classifications)
+
+        assert result["total_products_classified"] == 4
+        assert result["assignment_histogram"]["0"] == {"products": 1, "percentage": 25.0}
+        assert result["assignment_histogram"]["1"] == {"products": 1, "percentage": 25.0}
+        assert result["assignment_histogram"]["2"] == {"products": 1, "percentage": 25.0}
+        assert result["assignment_histogram"]["3"] == {"products": 1, "percentage": 25.0}
+
+    def test_histogram_summary(self, analyzer, classifications):
+        """Test summary counts and max assignments."""
+        summary = analyzer.generate_assignment_histogram(classifications)["summary"]
+
+        assert summary == {
+            "zero_assignments": 1,
+            "single_assignments": 1,
+            "multiple_assignments": 2,
+            "max_assignments_per_product": 3,
+        }
+
+    def test_multi_assignment_examples(self, analyzer, classifications):
+        """Test examples are ordered by count and carry assignments and slug."""
+        examples = analyzer.generate_assignment_histogram(classifications)["multi_assignment_examples"]
+
+        assert [e["product_id"] for e in examples] == ["3", "1"]
+        assert examples[0]["assignment_count"] == 3
+        assert examples[0]["assignments"] == [
+            "immune-support/cold-flu", "stress-mood-anxiety/sleep", "gut-health/digestion"
+        ]
+        assert examples[0]["product_slug"] is None
+        assert examples[1]["assignments"] == ["immune-support/mushroom-immune", "gut-health"]
+        assert examples[1]["product_slug"] == "four-mushroom"
+
+    def test_multi_assignment_examples_top_ten(self, analyzer):
+        """Test only the ten most-assigned products are kept as examples."""
+        classifications = [
+            {'product_id': str(pid), 'category_slug': f'cat-{n}', 'sub_category_slug': ''}
+            for pid in range(12) for n in range(pid + 2)
+        ]
+        classifications.append({'product_id': 'single', 'category_slug': 'gut-health', 'sub_category_slug': ''})
+
+        examples = analyzer.generate_assignment_histogram(classifications)["multi_assignment_examples"]
+
+        assert [e["product_id"] for e in examples] == [str(pid) for pid in range(11, 1, -1)]
+        assert examples[0]["assignments"] == [f'cat-{n}' for n in range(13)]
+
+    def test_empty_classifications(self, analyzer):
+        """Test histogram of no classifications."""
+        result = analyzer.generate_assignment_histogram([])
+
+        assert result["total_products_classified"] == 0
+        assert result["assignment_histogram"] == {}
+        assert result["summary"]["max_assignments_per_product"] == 0
+        assert result["multi_assignment_examples"] == []
+
+
+class TestCategoryDistribution:
+    """Test category and subcategory distribution."""
+
+    def test_distribution(self, analyzer, classifications):
+        """Test categories are sorted by count with nested subcategories."""
+        result = analyzer.generate_category_distribution(classifications)
+        distribution = result["category_distribution"]
+
+        assert result["total_assignments"] == 6
+        assert list(distribution) == ["immune-support", "gut-health", "stress-mood-anxiety"]
+        assert distribution["immune-support"]["count"] == 3
+        assert distribution["immune-support"]["percentage"] == 50.0
+        assert distribution["immune-support"]["subcategories"] == {
+            "mushroom-immune": {"count": 2, "percentage": 66.7},
+            "cold-flu": {"count": 1, "percentage": 33.3},
+        }
+        assert distribution["gut-health"]["subcategories"] == {
+            "digestion": {"count": 1, "percentage": 50.0},
+        }
+
+    def test_distribution_summary(self, analyzer, classifications):
+        """Test distribution summary."""
+        summary = analyzer.generate_category_distribution(classifications)["summary"]
+
+        assert summary == {
+            "total_categories": 3,
+            "total_subcategories": 4,
+            "top_category": "immune-support",
+            "top_category_count": 3,
+        }
+
+
+class TestQualityMetrics:
+    """Test quality and consistency metrics."""
+
+    def test_quality_metrics(self, analyzer, classifications):
+        """Test counts of products, empty fields, and consistency rate."""
+        metrics = analyzer.generate_quality_metrics(classifications)
+
+        assert metrics == {
+            "total_classifications": 7,
+            "unique_products": 3,
+            "empty_categories": 1,
+            "empty_subcategories": 2,
+            "consistency_rate": 33.3,
+        }
+
+    def test_quality_metrics_empty(self, analyzer):
+        """Test metrics of no classifications."""
+        metrics = analyzer.generate_quality_metrics([])
+
+        assert metrics["total_classifications"] == 0
+        assert metrics["consistency_rate"] == 0.0
+
+
+class TestReports:
+    """Test combined analyses and markdown report."""
+
+    def test_run_all_analyses(self, analyzer, classifications):
+        """Test every analysis is present in combined results."""
+        results = analyzer.run_all_analyses(classifications)
+
+        assert results["analysis_metadata"]["total_classifications"] == 7
+        for name in ("assignment_histogram", "category_distribution", "quality_metrics", "cost_analysis"):
+            assert name in results
+
+    def test_markdown_report(self, analyzer, classifications):
+        """Test markdown report sections and content."""
+        report = analyzer.generate_markdown_report(classifications)
+
+        assert report.startswith("# Classification Analysis Report")
+        assert "| 3 | 1 | 25.0% | 🔄 Multiple Categories |" in report
+        assert "| 0 | 1 | 25.0% | ⚠️ Failed Classification |" in report
+        assert "**immune-support:** 3 (50.0%)" in report
+        assert "  mushroom-immune: 2 (66.7%)" in report
+        assert "[four-mushroom](https://rogueherbalist.com/product/four-mushroom/)" in report
+        assert "   - Strong focus on immune system health products" in report
+
+    def test_markdown_report_business_context(self, analyzer):
+        """Test market focus lines for known and unlisted categories."""
+        report = analyzer.generate_markdown_report([
+            {'product_id': '1', 'category_slug': 'gut-health', 'sub_category_slug': ''},
+            {'product_id': '2', 'category_slug': 'sleep-support', 'sub_category_slug': ''},
+        ])
+
+        assert "1. **Gut Health** (50.0% of catalog)\n   - Significant emphasis on digestive wellness" in report
+        assert "2. **Sleep Support** (50.0% of catalog)\n   - Specialized health focus area" in report
+
+    def test_markdown_report_precomputed(self, analyzer, classifications):
+        """Test precomputed analyses are used instead of being rerun."""
+        results = analyzer.run_all_analyses(classifications)
+        results["quality_metrics"] = dict(results["quality_metrics"], consistency_rate=42.0)
+        results["category_distribution"] = {"error": "boom", "status": "failed"}
+
+        report = ClassificationAnalyzer().generate_markdown_report(classifications, precomputed=results)
+
+        assert "**Classification Accuracy:** 42.0%" in report
+        assert "**immune-support:** 3 (50.0%)" in report
+
+    def test_aggregation_failure_is_per_analysis(self, analyzer):
+        """Test rows that cannot be aggregated fail each analysis instead of raising."""
+        results = analyzer.run_all_analyses([None])
+
+        for name in ("assignment_histogram", "category_distribution", "quality_metrics"):
+            assert results[name]["status"] == "failed"
+
+    def test_cost_analysis_empty(self, analyzer):
+        """Test cost analysis of no classifications needs no pricing lookup."""
+        assert analyzer.generate_cost_analysis([], model_used="gpt-4o-mini") == {
+            "model_used": "gpt-4o-mini",
+            "total_classifications": 0,
+        }
+
+    def test_model_comparison_skips_unpriced_models(self, analyzer, monkeypatch):
+        """Test a model whose price lookup fails is left out of the comparison."""
+        lookups = []
+
+        def cost_per_token(model, prompt_tokens, completion_tokens):
+            lookups.append(model)
+            if model == "gpt-4o":
+                raise ValueError("model not mapped")
+            return prompt_tokens * 1e-6, completion_tokens * 2e-6
+
+        monkeypatch.setattr(analysis_engine, "_litellm", SimpleNamespace(cost_per_token=cost_per_token))
+
+        comparisons = analyzer._compare_model_costs_litellm(1000, 500, 0.002)
+        assert "gpt-4o" not in comparisons
+        assert comparisons["gpt-4o-mini"]["total_cost"] == pytest.approx(0.002)
+
+        # Prices are looked up once per analyzer
+        lookup_count = len(lookups)
+        analyzer._compare_model_costs_litellm(10, 5, 0.0)
+        assert len(lookups) == lookup_count
+
+    def test_appended_batches_match_fresh_analysis(self, analyzer, classifications):
+        """Test folding appended batches into passed intermediates matches a full recompute."""
+        rows = []
+        intermediates = aggregate_classifications([])
+        for start in range(0, len(classifications), 2):
+            batch = classifications[start:start + 2]
+            rows.extend(batch)
+            aggregate_classifications(batch, intermediates)
+            incremental = analyzer.run_all_analyses(rows, intermediates=intermediates)
+            fresh = ClassificationAnalyzer().run_all_analyses(list(rows))
+            for name in ("assignment_histogram", "category_distribution", "quality_metrics"):
+                assert incremental[name] == fresh[name]
+
+    def test_analyses_follow_list_changes(self, analyzer, classifications):
+        """Test each call sees rows appended or edited in place since the last one."""
+        assert analyzer.generate_quality_metrics(classifications)["unique_products"] == 3
+
+        classifications.append({'product_id': '4', 'category_slug': 'gut-health', 'sub_category_slug': 'digestion'})
+        assert analyzer.generate_quality_metrics(classifications)["unique_products"] == 4
+
+        classifications[-1]['product_id'] = '5'
+        classifications[0]['product_id'] = '5'
+        assert analyzer.generate_assignment_histogram(classifications)["multi_assignment_examples"][1]["product_id"] == "5"
+
+
+class TestLoadClassifications:
+    """Test loading classifications.csv from a run directory."""
+
+    def test_load_from_run(self, tmp_path):
+        """Test rows are loaded as dicts keyed by CSV header."""
+        outputs = tmp_path / "outputs"
+        outputs.mkdir()
+        (outputs / "classifications.csv").write_text(
+            "taxonomy_slug,category_slug,sub_category_slug,tag,product_id\n"
+            "health-areas,immune-support,mushroom-immune,,1111\n"
+            "health-areas,gut-health,,,1112\n"
+        )
+
+        classifications = load_classifications_from_run(tmp_path)
+
+        assert classifications == [
+            {'taxonomy_slug': 'health-areas', 'category_slug': 'immune-support',
+             'sub_category_slug': 'mushroom-immune', 'tag': '', 'product_id': '1111'},
+            {'taxonomy_slug': 'health-areas', 'category_slug': 'gut-health',
+             'sub_category_slug': '', 'tag': '', 'product_id': '1112'},
+        ]
+        assert list(load_classifications_stream(tmp_path)) == classifications
+
+    def test_load_missing_run(self, tmp_path):
+        """Test a run without classifications.csv loads as None."""
+        assert load_classifications_from_run(tmp_path) is None
+
+
+class TestSaveAnalysisResults:
+    """Test writing analysis outputs to a run directory."""
+
+    def test_save_analysis_results(self, tmp_path, analyzer, classifications):
+        """Test per-analysis, combined, and markdown outputs are written."""
+        results = analyzer.run_all_analyses(classifications)
+
+        save_analysis_results(tmp_path, results, "_v2", classifications)
+
+        outputs = tmp_path / "outputs"
+        combined = json.loads((outputs / "combined_analysis_v2.json").read_text())
+        assert combined == results
+        histogram = json.loads((outputs / "assignment_histogram_v2.json").read_text())
+        assert histogram == results["assignment_histogram"]
+        assert not (outputs / "analysis_metadata_v2.json").exists()
+        report = (outputs / "classification_report_v2.md").read_text()
+        assert report.startswith("# Classification Analysis Report")
+
+    def test_save_with_analyzer(self, tmp_path, classifications):
+        """Test the markdown report comes from the analyzer passed in."""
+        analyzer = ClassificationAnalyzer(analysis_version="2.0")
+        results = analyzer.run_all_analyses(classifications)
+
+        save_analysis_results(tmp_path, results, "", classifications, analyzer=analyzer)
+
+        report = (tmp_path / "outputs" / "classification_report.md").read_text()
+        assert "using Analysis Engine v2.0" in report
+
+    def test_save_empty_run(self, tmp_path, analyzer):
+        """Test a run that classified nothing still gets its markdown report."""
+        results = analyzer.run_all_analyses([])
+
+        save_analysis_results(tmp_path, results, "", [], analyzer=analyzer)
+
+        report = (tmp_path / "outputs" / "classification_report.md").read_text()
+        assert "**Total Products Classified:** 0" in report
+
+    def test_save_combined_only(self, tmp_path, analyzer, classifications):
+        """Test per-analysis files can be skipped."""
+        results = analyzer.run_all_analyses(classifications)
+
+        save_analysis_results(tmp_path, results, write_individual=False)
+
+        outputs = tmp_path / "outputs"
+        assert sorted(p.name for p in outputs.iterdir()) == ["combined_analysis.json"]
@@ -5,6 +5,7 @@ Smoke tests for document generation framework.
 Tests basic functionality of validators, differs, and runners without calling LLMs.
 """
 
+import importlib.util
 import sys
 from pathlib import Path
 
@@ -52,6 +53,67 @@ def test_xml_validator():
     print("✅ XML validator tests passed\n")
 
 
+def _load_framework(use_lxml):
+    """Load a separate copy of the framework on the lxml or xml.etree backend."""
+    blocked = {} if use_lxml else {"lxml": None, "lxml.etree": None}
+    saved = {name: sys.modules.get(name, ...) for name in blocked}
+    sys.modules.update(blocked)
+    try:
+        path = Path(__file__).parent.parent / "src" / "document_generation_framework.py"
+        spec = importlib.util.spec_from_file_location("document_generation_framework_backend", path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    finally:
+        for name, old in saved.items():
+            if old is ...:
+                del sys.modules[name]
+            else:
+                sys.modules[name] = old
+    return module
+
+
+def test_xml_backends():
+    """Test lxml and xml.etree parse entities and bytes the same way."""
+    print("Testing XML backends...")
+
+    internal = ('<!DOCTYPE taxonomy [<!ENTITY herb "Echinacea">]>'
+                '<taxonomy><taxon slug="a" type="primary"><title>&herb;</title>'
+                '<description>About &herb;</description></taxon></taxonomy>')
+    external = ('<!DOCTYPE taxonomy [<!ENTITY secret SYSTEM "file:///etc/hostname">]>'
+                '<taxonomy><taxon slug="a"><title>&secret;</title></taxon></taxonomy>')
+    latin1 = '<?xml version="1.0" encoding="ISO-8859-1"?><taxonomy><taxon slug="a"><title>Caf\xe9</title></taxon></taxonomy>'
+
+    backends = [False]
+    if importlib.util.find_spec("lxml") is not None:
+        backends.append(True)
+    else:
+        print("  ⚠️  lxml not installed, testing xml.etree only")
+
+    for use_lxml in backends:
+        framework = _load_framework(use_lxml)
+        assert framework.LXML_AVAILABLE == use_lxml, "Should load the requested backend"
+        name = "lxml" if use_lxml else "xml.etree"
+
+        # Internal entities are expanded on both backends
+        root = framework.parse_xml(internal)
+        assert root.find("taxon/title").text == "Echinacea", f"{name} should expand internal entities"
+        taxons = framework.DocumentDiffer()._extract_taxons(internal)
+        assert taxons["a"]["description"] == "About Echinacea", f"{name} should expand entities in taxons"
+
+        # External entities are never loaded
+        is_valid, _ = framework.DocumentValidator.validate_xml(external)
+        assert not is_valid, f"{name} should reject external entities"
+
+        # Bytes follow their own encoding declaration
+        root = framework.parse_xml(latin1.encode("iso-8859-1"))
+        assert root.find("taxon/title").text == "Caf\xe9", f"{name} should decode bytes by declaration"
+        events = [elem.tag for _, elem in framework.iterparse_xml(latin1.encode("iso-8859-1"), ("end",))]
+        assert events == ["title", "taxon", "taxonomy"], f"{name} should iterparse bytes"
+        print(f"  ✅ {name} backend consistent")
+
+    print("✅ XML backend tests passed\n")
+
+
 def test_taxonomy_structure_validator():
     """Test taxonomy-specific structure validation."""
     print("Testing taxonomy structure validator...")
@@ -113,6 +175,53 @@ def test_taxonomy_structure_validator():
     print("✅ Taxonomy structure validator tests passed\n")
 
 
+def test_validation_cache():
+    """Test repeated validation reuses cached results."""
+    print("Testing validation cache...")
+
+    import document_generation_framework as framework
+
+    calls = []
+    original_parse = framework.parse_xml
+
+    def counting_parse(content):
+        calls.append(content)
+        return original_parse(content)
+
+    content = '<taxonomy version="1.0"><taxon slug="cache-test"><title>Cache</title></taxon></taxonomy>'
+    framework.parse_xml = counting_parse
+    try:
+        first = DocumentValidator.validate_xml(content)
+        second = DocumentValidator().validate_xml(content)
+        invalid = DocumentValidator.validate_xml(content + "<")
+    finally:
+        framework.parse_xml = original_parse
+
+    assert first == second == (True, ""), "Cached result should match"
+    assert not invalid[0], "Different content should be validated separately"
+    assert len(calls) == 2, f"Same content should be parsed once, parsed {len(calls)} times"
+    print("  ✅ Repeated validation served from cache")
+
+    # Cached taxon counts are shared, so callers cannot modify them
+    counts = DocumentValidator.inspect_taxonomy(content)[2]
+    try:
+        counts["total"] = 0
+    except TypeError:
+        pass
+    assert DocumentValidator.inspect_taxonomy(content)[2]["total"] == 1, "Cached counts should be read-only"
+
+    # Concurrent validators share the caches without corrupting them
+    from concurrent.futures import ThreadPoolExecutor
+    documents = [f'{{"n": {i % (framework.VALIDATION_CACHE_SIZE + 50)}}}' for i in range(2000)]
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(DocumentValidator.validate_json, documents))
+    assert results == [(True, "")] * len(documents), "Concurrent validation should succeed"
+    assert framework._validation_result.cache_info().currsize <= framework.VALIDATION_CACHE_SIZE, "Cache should stay bounded"
+    print("  ✅ Cache is safe to share between threads")
+
+    print("✅ Validation cache tests passed\n")
+
+
 def test_json_validator():
     """Test JSON validation."""
     print("Testing JSON validator...")
@@ -158,6 +267,43 @@ Line 5"""
     assert diff.stats['additions'] > 0, "Should detect additions"
     assert diff.stats['deletions'] > 0, "Should detect deletions"
     assert len(diff.unified_diff) > 0, "Should generate unified diff"
+    assert diff.added_lines == ["Line 2 modified\n", "Line 5"], "Should list added lines"
+    assert diff.removed_lines == ["Line 2\n", "Line 4"], "Should list removed lines"
+
+    # Changed lines that look like diff file headers are still counted
+    diff = differ.diff_text("--- a\nkeep\n", "+++ b\nkeep\n")
+    assert diff.added_lines == ["+++ b\n"], "Should count header-like additions"
+    assert diff.removed_lines == ["--- a\n"], "Should count header-like deletions"
+
+    # Repeated lines in long documents are paired as unchanged
+    before = "".join(f"line {i}\n" for i in range(10)) + "</taxon>\n" * 5
+    after = "<x/>\n" * 3 + "</taxon>\n" * 5 + "".join(f"other {i}\n" for i in range(200))
+    diff = differ.diff_text(before, after)
+    assert (diff.stats['additions'], diff.stats['deletions']) == (203, 10), "Should pair repeated lines"
+
+    # Counts and unified diff come from the same alignment, even where
+    # difflib's autojunk would treat a frequent line as junk
+    before = "</taxon>\n" * 300
+    diff = differ.diff_text(before, "<taxon/>\n" + before)
+    assert diff.added_lines == ["<taxon/>\n"], "Should add only the new line"
+    assert diff.removed_lines == [], "Should remove nothing"
+    assert diff.unified_diff.split("\n")[2:4] == ["@@ -1,3 +1,4 @@", "+<taxon/>"], "Hunk should match counts"
+
+    # Oversized inputs skip the line-matching diff
+    big_before = "".join(f"<item>{i % 50}</item>\n" for i in range(6000))
+    big_after = big_before.replace("<item>7</item>", "<item>new</item>", 1)
+    diff = differ.diff_text(big_before, big_after)
+    assert diff.unified_diff == "", "Oversized diff should skip unified diff"
+    assert diff.added_lines == ["<item>new</item>\n"], "Should still find added lines"
+    assert diff.removed_lines == ["<item>7</item>\n"], "Should still find removed lines"
+    assert "note" in diff.stats, "Should note the coarse comparison"
+    assert diff.stats["approximate"] is True, "Should flag the counts as approximate"
+
+    # Moved lines cost nothing when compared as multisets
+    diff = differ.diff_text(big_before, big_before[len("<item>0</item>\n"):] + "<item>0</item>\n")
+    assert diff.stats["total_changes"] == 0, "Coarse path ignores line order"
+    assert differ.diff_text("a\nb\n", "b\na\n").stats["total_changes"] == 2, "Line diff counts a move"
+    assert differ.diff_text("a\nb\n", "b\na\n").stats["approximate"] is False, "Line diff is exact"
 
     print("  ✅ Text diff generated successfully")
     print(f"  📊 Stats: {diff.stats['additions']} additions, {diff.stats['deletions']} deletions")
@@ -203,6 +349,57 @@ def test_xml_differ():
     print("✅ XML differ tests passed\n")
 
 
+def test_taxonomy_change_analysis():
+    """Test taxonomy change analysis over nested taxons."""
+    print("Testing taxonomy change analysis...")
+
+    differ = DocumentDiffer()
+
+    before_xml = """<?xml version="1.0" encoding="UTF-8"?>
+<taxonomy>
+    <taxon slug="immune-support" type="primary">
+        <title>Immune Support</title>
+        <description>Immune system support</description>
+        <taxon slug="cold-flu" type="subcategory">
+            <title>Cold &amp; Flu</title>
+            <description>Seasonal support</description>
+        </taxon>
+    </taxon>
+</taxonomy>"""
+
+    after_xml = """<?xml version="1.0" encoding="UTF-8"?>
+<taxonomy>
+    <taxon slug="immune-support" type="primary">
+        <title>Immune Support</title>
+        <description>Immune system support</description>
+        <ingredients>
+            <common><item>Echinacea</item><item>Elderberry</item></common>
+            <other><item>Astragalus</item></other>
+        </ingredients>
+        <taxon slug="cold-flu" type="subcategory">
+            <title>Cold &amp; Flu</title>
+            <description>Seasonal immune support</description>
+        </taxon>
+        <taxon slug="mushroom-immune" type="subcategory">
+            <title>Mushroom Immune</title>
+        </taxon>
+    </taxon>
+</taxonomy>"""
+
+    changes = differ.analyze_taxonomy_changes(before_xml, after_xml)
+
+    assert 'error' not in changes, f"Analysis failed: {changes.get('error')}"
+    assert changes['new_taxons'] == ['mushroom-immune'], "Should find nested new taxon"
+    assert changes['removed_taxons'] == [], "Should find no removed taxons"
+    assert [c['slug'] for c in changes['modified_descriptions']] == ['cold-flu']
+    assert changes['added_ingredients'][0]['common_count'] == 2, "Should count common items"
+    assert changes['added_ingredients'][0]['other_count'] == 1, "Should count other items"
+    assert changes['stats_by_category']['immune-support']['total_ingredients'] == 3
+
+    print("  ✅ Taxonomy changes analyzed successfully")
+    print("✅ Taxonomy change analysis tests passed\n")
+
+
 def test_diff_report_generation():
     """Test markdown diff report generation."""
     print("Testing diff report generation...")
@@ -243,10 +440,13 @@ def run_all_tests():
 
     try:
         test_xml_validator()
+        test_xml_backends()
         test_taxonomy_structure_validator()
+        test_validation_cache()
         test_json_validator()
         test_text_differ()
         test_xml_differ()
+        test_taxonomy_change_analysis()
         test_diff_report_generation()
 
         print("=" * 60)
@@ -4,12 +4,18 @@ Unit tests for HealthQuizUseCase implementation.
 Tests input validation, consultation logic, and business logic without LLM calls.
 """
 
+import asyncio
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
 from src.health_quiz_use_case import (
     HealthQuizInput,
     HealthQuizOutput,
     ProductRecommendation,
-    HealthQuizUseCase
+    HealthQuizUseCase,
+    HEALTH_CATEGORIES
 )
 
 
@@ -106,6 +112,44 @@ class TestHealthQuizOutput:
         assert result["confidence_score"] == 0.7
         assert result["consultation_recommended"] is False
 
+    def test_to_dict_nested_products(self):
+        """Test nested product recommendations are converted to dictionaries."""
+        rec = ProductRecommendation(
+            product_id="TEST-001",
+            title="Test Product",
+            description="Test description",
+            category="immune_support",
+            relevance_score=0.85,
+            purchase_link="https://example.com/product/test",
+            rationale="Recommended because...",
+            ingredient_highlights=["Ingredient 1"]
+        )
+        output = HealthQuizOutput(
+            general_recommendations=["Advice 1"],
+            specific_products=[rec],
+            educational_content=[],
+            lifestyle_suggestions=[],
+            follow_up_questions=[],
+            primary_categories_addressed=["immune_support"],
+            confidence_score=0.7,
+            consultation_recommended=True
+        )
+
+        result = output.to_dict()
+
+        assert result["specific_products"] == [{
+            "product_id": "TEST-001",
+            "title": "Test Product",
+            "description": "Test description",
+            "category": "immune_support",
+            "relevance_score": 0.85,
+            "purchase_link": "https://example.com/product/test",
+            "rationale": "Recommended because...",
+            "ingredient_highlights": ["Ingredient 1"],
+        }]
+        result["general_recommendations"].append("Advice 2")
+        assert output.general_recommendations == ["Advice 1"]
+
 
 class TestHealthQuizUseCase:
     """Test HealthQuizUseCase business logic."""
@@ -126,6 +170,36 @@ class TestHealthQuizUseCase:
         assert is_valid is True
         assert error is None
 
+    def test_execute_parses_input_once(self, sample_health_quiz_input, monkeypatch):
+        """Test a request through the use case manager parses its input once."""
+        # The registry the use case registered itself with
+        from use_case_framework import UseCaseManager, use_case_registry
+
+        manager = UseCaseManager(use_case_registry)
+        original_from_dict = HealthQuizInput.from_dict
+        calls = []
+
+        def counting_from_dict(data):
+            calls.append(data)
+            return original_from_dict(data)
+
+        monkeypatch.setattr(HealthQuizInput, "from_dict", counting_from_dict)
+        result = asyncio.run(manager.execute_use_case(
+            "test_client", "health_quiz", sample_health_quiz_input.to_dict()
+        ))
+
+        assert result.success is True
+        assert len(calls) == 1
+
+        # Invalid input is rejected after the same single parse
+        calls.clear()
+        result = asyncio.run(manager.execute_use_case(
+            "test_client", "health_quiz", {"health_issue_description": "Short"}
+        ))
+        assert result.success is False
+        assert "at least 10 characters" in result.metadata["error"]
+        assert len(calls) == 1
+
     def test_validate_input_missing_description(self, health_quiz_use_case):
         """Test validation fails when description is missing."""
         input_data = {
@@ -260,11 +334,12 @@ class TestHealthQuizUseCase:
         assert "immune_support" in categories
         assert len(categories) == 1
 
-    def test_load_health_categories(self, health_quiz_use_case):
-        """Test health categories are loaded."""
-        categories = health_quiz_use_case._load_health_categories()
+    def test_health_categories(self, health_quiz_use_case):
+        """Test health categories come from the module constant as a list."""
+        categories = health_quiz_use_case.taxonomy_categories
 
         assert isinstance(categories, list)
+        assert categories == list(HEALTH_CATEGORIES)
         assert len(categories) > 0
         assert "immune_support" in categories
         assert "digestive_health" in categories
@@ -296,6 +371,21 @@ class TestHealthQuizUseCase:
         assert isinstance(recommendations["general_advice"], list)
         assert len(recommendations["general_advice"]) > 0
 
+    def test_recommendation_engine_reused(self, health_quiz_use_case):
+        """Test the recommendation engine is built once and reused across requests."""
+        quiz_input = HealthQuizInput(
+            health_issue_description="Test issue",
+            primary_health_area="immune_support"
+        )
+
+        health_quiz_use_case._find_relevant_products(quiz_input, {})
+        engine = health_quiz_use_case._recommendation_engine
+        health_quiz_use_case._find_relevant_products(quiz_input, {})
+
+        assert engine is not None
+        assert health_quiz_use_case._recommendation_engine is engine
+        assert engine.client_id == "test_client"
+
     def test_get_prompt_template_basic(self, health_quiz_use_case):
         """Test prompt template generation with basic input."""
         quiz_input = HealthQuizInput(
@@ -317,6 +407,74 @@ class TestHealthQuizUseCase:
         assert sample_health_quiz_input.primary_health_area in prompt
         assert str(sample_health_quiz_input.severity_level) in prompt
 
+    def test_llm_prompt_matches_template(self, health_quiz_use_case, sample_health_quiz_input):
+        """Test the prompt sent to the LLM is the template built from the input dict."""
+        sent = []
+
+        class FakeClient:
+            def complete_sync(self, messages, response_format=None):
+                sent.append(messages[0]["content"])
+                return '{"general_advice": ["Rest"]}'
+
+        health_quiz_use_case.set_dependencies(FakeClient(), None)
+        recommendations = health_quiz_use_case._generate_llm_recommendations(sample_health_quiz_input)
+
+        assert recommendations == {"general_advice": ["Rest"]}
+        assert sent == [health_quiz_use_case.get_prompt_template(sample_health_quiz_input.to_dict())]
+
+    def test_engine_built_during_llm_call(self, health_quiz_use_case, sample_health_quiz_input, monkeypatch):
+        """Test the recommendation engine is built while the LLM call is in flight."""
+        built = threading.Event()
+        threads = []
+
+        class FakeEngine:
+            def __init__(self, client_id, catalog_path=None, config=None):
+                threads.append(threading.current_thread().name)
+                built.set()
+
+            def recommend_products(self, **kwargs):
+                return []
+
+        class FakeClient:
+            def complete_sync(self, messages, response_format=None):
+                assert built.wait(timeout=5)
+                return '{"general_advice": ["Rest"]}'
+
+        monkeypatch.setattr(sys.modules[HealthQuizUseCase.__module__], "ProductRecommendationEngine", FakeEngine)
+        health_quiz_use_case.set_dependencies(FakeClient(), None)
+        result = health_quiz_use_case.process_request(sample_health_quiz_input.to_dict())
+
+        assert result.success is True
+        assert result.data["general_recommendations"] == ["Rest"]
+        assert isinstance(health_quiz_use_case._recommendation_engine, FakeEngine)
+        assert threads[0].startswith("health-quiz-engine"), "Should use the engine executor"
+
+        executor = health_quiz_use_case._engine_executor
+        health_quiz_use_case.close()
+        assert health_quiz_use_case._engine_executor is None
+        assert executor._shutdown, "close() should shut the engine executor down"
+        health_quiz_use_case.close()  # Safe to call again
+
+    def test_engine_built_once_across_threads(self, health_quiz_use_case, monkeypatch):
+        """Test concurrent first requests share one recommendation engine."""
+        builds = []
+        start = threading.Barrier(4)
+
+        class FakeEngine:
+            def __init__(self, client_id, catalog_path=None, config=None):
+                builds.append(self)
+
+        def get_engine():
+            start.wait(timeout=5)
+            return health_quiz_use_case._get_recommendation_engine()
+
+        monkeypatch.setattr(sys.modules[HealthQuizUseCase.__module__], "ProductRecommendationEngine", FakeEngine)
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            engines = list(executor.map(lambda _: get_engine(), range(4)))
+
+        assert len(builds) == 1
+        assert all(engine is builds[0] for engine in engines)
+
 
 @pytest.mark.parametrize("severity,expected_consultation", [
     (1, False),